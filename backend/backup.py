@@ -0,0 +1,223 @@
+"""
+Online backup and streaming export/import of the mods table.
+
+The backup uses SQLite's backup API and copies BACKUP_PAGES pages per step.
+Between steps it pauses so that requests can take the write lock, which
+means a large database never blocks the app for the whole copy.
+
+Exports page through the mods table by id, and imports commit in batches of
+IMPORT_BATCH rows. Memory use therefore stays flat however many mods there
+are, and no read transaction is held open while a slow client downloads.
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import sqlite3
+import time
+import zlib
+from datetime import datetime
+from typing import Callable, Iterator, Optional
+from database import DB_PATH, get_mods_page, get_mod_columns, import_mods
+
+BACKUP_DIR = os.getenv("BACKUP_DIR") or os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), "backups")
+BACKUP_PAGES = int(os.getenv("BACKUP_PAGES", "256"))
+BACKUP_STEP_SLEEP = float(os.getenv("BACKUP_STEP_SLEEP", "0.005"))
+BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", "5"))
+# Stepped attempts before falling back to a single-step copy
+BACKUP_MAX_RESTARTS = 3
+
+EXPORT_PAGE = 500
+IMPORT_BATCH = 500
+EXPORT_FORMATS = ('ndjson', 'csv.gz')
+REQUIRED_COLUMNS = ('local_file', 'mod_id', 'file_id', 'game')
+# Import error messages kept for the response
+MAX_ERRORS = 10
+
+class _Restarted(Exception):
+    """The source changed under a stepped backup, so SQLite started over"""
+
+def _copy(dest: str, pages: int, progress: Optional[Callable[[int, int], None]]) -> int:
+    """One backup attempt; returns the page count or raises _Restarted"""
+    state = {'remaining': None, 'total': 0}
+
+    def step(status, remaining, total):
+        if state['remaining'] is not None and remaining > state['remaining']:
+            raise _Restarted()
+        state['remaining'], state['total'] = remaining, total
+        if progress:
+            progress(total - remaining, total)
+        # Give writers a window between steps
+        time.sleep(BACKUP_STEP_SLEEP)
+
+    src = sqlite3.connect(DB_PATH)
+    dst = sqlite3.connect(dest)
+    try:
+        src.backup(dst, pages=pages, progress=step, sleep=BACKUP_STEP_SLEEP)
+    finally:
+        src.close()
+        dst.close()
+    return state['total']
+
+def backup_database(progress: Optional[Callable[[int, int], None]] = None) -> dict:
+    """
+    Copy the live database to BACKUP_DIR; progress(done_pages, total_pages).
+    A write from another connection makes SQLite restart a stepped backup, so
+    each restart quadruples the step size, and the last attempt copies in one
+    step, which only briefly holds off writers.
+    """
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    name = f"nexusmods_tracker-{stamp}.db"
+    suffix = 1
+    while os.path.exists(os.path.join(BACKUP_DIR, name)):
+        suffix += 1
+        name = f"nexusmods_tracker-{stamp}-{suffix}.db"
+    dest = os.path.join(BACKUP_DIR, name)
+    partial = dest + ".part"
+
+    start = time.monotonic()
+    pages = BACKUP_PAGES
+    restarts = 0
+    try:
+        while True:
+            try:
+                total = _copy(partial, pages if restarts < BACKUP_MAX_RESTARTS else -1, progress)
+                break
+            except _Restarted:
+                restarts += 1
+                pages *= 4
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    os.replace(partial, dest)
+    _prune_backups()
+    elapsed = time.monotonic() - start
+    print(f"[backup] Wrote {name} ({total} pages, {restarts} restarts) in {elapsed:.2f}s")
+    return {
+        'filename': name,
+        'size_bytes': os.path.getsize(dest),
+        'pages': total,
+        'restarts': restarts,
+        'seconds': round(elapsed, 3),
+    }
+
+def list_backups() -> list:
+    """Backups in BACKUP_DIR, newest first"""
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    found = []
+    with os.scandir(BACKUP_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith('.db') and entry.is_file():
+                found.append((entry.stat(), entry.name))
+    found.sort(key=lambda f: (f[0].st_mtime_ns, f[1]), reverse=True)
+    return [
+        {
+            'filename': name,
+            'size_bytes': st.st_size,
+            'created_at': datetime.fromtimestamp(st.st_mtime).isoformat(),
+        }
+        for st, name in found
+    ]
+
+def _prune_backups():
+    for old in list_backups()[BACKUP_KEEP:]:
+        os.remove(os.path.join(BACKUP_DIR, old['filename']))
+        print(f"[backup] Removed old backup {old['filename']}")
+
+def _iter_rows() -> Iterator:
+    last_id = 0
+    while True:
+        rows = get_mods_page(last_id, EXPORT_PAGE)
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1]['id']
+
+def export_ndjson() -> Iterator[bytes]:
+    """Mods as newline-delimited JSON, one page at a time"""
+    buffer = []
+    for row in _iter_rows():
+        buffer.append(json.dumps(dict(row), ensure_ascii=False))
+        if len(buffer) >= EXPORT_PAGE:
+            yield ("\n".join(buffer) + "\n").encode()
+            buffer = []
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode()
+
+def export_csv_gz() -> Iterator[bytes]:
+    """Mods as gzip-compressed CSV with a header row, compressed as it streams"""
+    columns = get_mod_columns()
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(columns)
+    count = 0
+    for row in _iter_rows():
+        writer.writerow(['' if row[c] is None else row[c] for c in columns])
+        count += 1
+        if count % EXPORT_PAGE == 0:
+            chunk = compressor.compress(text.getvalue().encode())
+            text.seek(0)
+            text.truncate()
+            if chunk:
+                yield chunk
+    yield compressor.compress(text.getvalue().encode()) + compressor.flush()
+
+def _records(raw, fmt: str, errors: list) -> Iterator[Optional[dict]]:
+    """
+    Parse an uploaded export (gzip detected from the magic bytes). Yields
+    None for an unparseable NDJSON line after noting it in `errors`.
+    """
+    gzipped = raw.read(2) == b'\x1f\x8b'
+    raw.seek(0)
+    text = io.TextIOWrapper(gzip.GzipFile(fileobj=raw) if gzipped else raw, encoding='utf-8', newline='')
+    if fmt == 'ndjson':
+        for number, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                if len(errors) < MAX_ERRORS:
+                    errors.append(f"line {number}: {e}")
+                yield None
+    else:
+        for record in csv.DictReader(text):
+            # CSV has no NULL; column affinity turns numeric strings back into numbers
+            yield {k: (None if v == '' else v) for k, v in record.items()}
+
+def import_file(raw, fmt: str) -> dict:
+    """Import mods from a seekable binary file, IMPORT_BATCH rows per transaction"""
+    columns = [c for c in get_mod_columns() if c != 'id']
+    totals = {'inserted': 0, 'skipped': 0, 'invalid': 0}
+    errors = []
+    batch = []
+
+    def flush():
+        result = import_mods(batch, columns)
+        totals['inserted'] += result['inserted']
+        totals['skipped'] += result['skipped']
+        batch.clear()
+
+    for number, record in enumerate(_records(raw, fmt, errors), 1):
+        if not isinstance(record, dict):
+            totals['invalid'] += 1
+            continue
+        missing = [c for c in REQUIRED_COLUMNS if record.get(c) in (None, '')]
+        if missing:
+            totals['invalid'] += 1
+            if len(errors) < MAX_ERRORS:
+                errors.append(f"record {number}: missing {', '.join(missing)}")
+            continue
+        batch.append(record)
+        if len(batch) >= IMPORT_BATCH:
+            flush()
+    if batch:
+        flush()
+    print(f"[backup] Imported {totals['inserted']} mods "
+          f"({totals['skipped']} duplicates, {totals['invalid']} invalid)")
+    return {**totals, 'errors': errors}
@@ -0,0 +1,88 @@
+"""
+Latency of the /api/nexusmods passthrough against a stubbed slow upstream.
+
+Run from backend/:  python benchmarks/nexus_proxy_latency.py [--delay 1.5]
+
+Uses a throwaway MODS_DIR/database and a fake Nexusmods client whose calls
+sleep for --delay seconds, serves the app with uvicorn on a local port, then
+times cold (miss), warm (hit), stale (served from cache, refreshed in the
+background) and offline requests.
+"""
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class SlowClient:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def get_mod_details(self, game, mod_id):
+        time.sleep(self.delay)
+        return {'mod_id': mod_id, 'name': f'Mod {mod_id}', 'summary': '', 'author': 'bench',
+                'version': '1.0', 'updated_time': '2025-01-01T00:00:00'}
+
+    def get_mod_files(self, game, mod_id):
+        time.sleep(self.delay)
+        return [{'file_id': 1, 'name': 'Main', 'version': '1.0', 'category_name': 'MAIN',
+                 'size_kb': 1, 'uploaded_time': '2025-01-01T00:00:00', 'file_name': 'main.zip'}]
+
+def _time(session, url, n=20):
+    samples = []
+    status = None
+    for _ in range(n):
+        start = time.perf_counter()
+        r = session.get(url)
+        samples.append((time.perf_counter() - start) * 1000)
+        status = r.headers.get("X-Cache")
+    samples.sort()
+    return samples[len(samples) // 2], status
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=1.5, help="upstream latency in seconds")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ["MODS_DIR"] = os.path.join(tmp, "Mods")
+    os.environ.setdefault("NEXUSMODS_API_KEY", "bench")
+
+    import requests
+    import uvicorn
+    import nexusmods_client
+    import nexus_cache
+    from main import app
+
+    nexusmods_client._client = SlowClient(args.delay)
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    url = f"http://127.0.0.1:{port}/api/nexusmods/mods/bench/1"
+    session = requests.Session()
+    try:
+        cold = _time(session, url, n=1)
+        warm = _time(session, url)
+        nexus_cache.FRESH_SECONDS = 0
+        stale = _time(session, url)
+        nexus_cache.set_offline(True)
+        offline = _time(session, url)
+    finally:
+        server.should_exit = True
+
+    print(f"upstream delay     {args.delay * 1000:8.1f} ms")
+    for label, (ms, status) in (("cold", cold), ("warm", warm), ("stale", stale), ("offline", offline)):
+        print(f"{label:8} {status or '-':8} {ms:8.1f} ms (median)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Backend cold-start time, as paid on every run.sh auto-reload.
+
+Run from backend/:  python benchmarks/startup.py [--runs 10]
+
+Each run is a fresh interpreter that imports main and runs the startup
+(lifespan) hook against a throwaway database. The first run migrates an
+empty database; later runs hit an already-migrated one, which should skip
+all schema introspection. Reports medians and whether pynxm was imported.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CHILD = """
+import json, sys, time, asyncio
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+async def startup():
+    async with main.lifespan(main.app):
+        pass
+asyncio.run(startup())
+t2 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "startup_ms": (t2 - t1) * 1000,
+                  "pynxm_loaded": "pynxm" in sys.modules}))
+"""
+
+def _run(env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    env = dict(os.environ, MODS_DIR=os.path.join(tmp, "Mods"), NEXUSMODS_API_KEY="bench")
+
+    first = _run(env)
+    warm = [_run(env) for _ in range(args.runs)]
+
+    def median(key):
+        return statistics.median(r[key] for r in warm)
+
+    print(f"first start (migrates)   import {first['import_ms']:7.1f} ms   startup {first['startup_ms']:7.1f} ms")
+    print(f"restart (median of {args.runs:2})  import {median('import_ms'):7.1f} ms   startup {median('startup_ms'):7.1f} ms")
+    print(f"pynxm imported at startup: {any(r['pynxm_loaded'] for r in warm)}")
+
+if __name__ == "__main__":
+    main()
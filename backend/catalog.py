@@ -0,0 +1,50 @@
+"""
+Local mirror of Nexusmods' game-wide updated-mods feed.
+
+game_updated_list(game, period) returns every mod in a game that changed in
+the last day/week/month. Instead of throwing each response away, it is merged
+into nexus_updated_mods, and nexus_catalog_sync records the time range the
+mirror is known to be complete for. "Has mod X changed since T?" is then a
+local indexed lookup whenever T falls inside that range.
+"""
+import time
+from typing import Optional
+from database import get_catalog_sync, merge_updated_catalog, get_catalog_entries
+
+PERIOD_SECONDS = {'1d': 86400, '1w': 7 * 86400, '1m': 30 * 86400}
+
+# Don't hit the feed again for a game synced this recently
+MIN_SYNC_INTERVAL = 300
+
+def _pick_period(since_last_sync: Optional[float]) -> str:
+    """Smallest feed period that overlaps the previous sync"""
+    if since_last_sync is None:
+        return '1m'
+    for period in ('1d', '1w'):
+        if since_last_sync < PERIOD_SECONDS[period]:
+            return period
+    return '1m'
+
+def sync_catalog(client, game: str, force: bool = False) -> dict:
+    """
+    Bring the mirror for a game up to date with one feed call (or none if it
+    was synced within MIN_SYNC_INTERVAL). Returns the coverage row.
+    Raises whatever the client raises if the feed is unavailable.
+    """
+    now = int(time.time())
+    sync = get_catalog_sync(game)
+    if sync and not force and now - sync['synced_at'] < MIN_SYNC_INTERVAL:
+        return sync
+    period = _pick_period(now - sync['synced_at'] if sync else None)
+    entries = client.get_updated_mods(game, period)
+    merge_updated_catalog(game, entries, now - PERIOD_SECONDS[period], now)
+    print(f"[catalog] {game}: merged {len(entries)} entries from {period} feed")
+    return get_catalog_sync(game)
+
+def covers(sync: Optional[dict], since: float) -> bool:
+    """Whether the mirror is complete from `since` (unix seconds) onwards"""
+    return bool(sync) and sync['covered_since'] <= since
+
+def changed_since(game: str, since: float, mod_ids=None) -> dict:
+    """Mirror entries whose files changed after `since`, keyed by mod_id"""
+    return get_catalog_entries(game, mod_ids, int(since))
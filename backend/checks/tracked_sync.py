@@ -0,0 +1,77 @@
+"""
+Regression check for the tracked-list sync against a stub Nexusmods client.
+
+Run from backend/:  python checks/tracked_sync.py
+
+Uses a throwaway MODS_DIR/database. The user tracks a mod on the website
+after the last pull, the same mod is then added locally, synced, deleted
+locally and synced again. The website track must never be marked managed,
+so the second sync must not untrack it. Exits non-zero on failure.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class StubClient:
+    hourly_remaining = None
+
+    def __init__(self):
+        self.tracked = set()
+        self.calls = []
+
+    def get_tracked_mods(self):
+        self.calls.append(('pull',))
+        return [{'domain_name': game, 'mod_id': mod_id} for game, mod_id in sorted(self.tracked)]
+
+    def track_mod(self, game, mod_id):
+        self.calls.append(('track', game, mod_id))
+        self.tracked.add((game, mod_id))
+
+    def untrack_mod(self, game, mod_id):
+        self.calls.append(('untrack', game, mod_id))
+        self.tracked.discard((game, mod_id))
+
+def main():
+    tmp = tempfile.mkdtemp()
+    os.environ["MODS_DIR"] = os.path.join(tmp, "Mods")
+
+    from database import init_db, create_mod, delete_mod, get_tracked
+    from tracking import sync_tracked
+
+    init_db()
+    client = StubClient()
+    failures = []
+
+    sync_tracked(client, force_pull=True)
+    client.tracked.add(('g', 42))  # tracked on the website; the stored list doesn't know yet
+    mod = create_mod({'local_file': 'site.zip', 'mod_id': 42, 'file_id': 1, 'game': 'g'})
+    sync_tracked(client)
+    managed = {(e['game'], e['mod_id']): e['managed'] for e in get_tracked()}
+    if managed.get(('g', 42)):
+        failures.append("website-tracked mod 42 was stored as managed")
+    if ('track', 'g', 42) in client.calls:
+        failures.append("sync re-tracked a mod that was already tracked")
+
+    delete_mod(mod['id'])
+    sync_tracked(client)
+    if ('g', 42) not in client.tracked:
+        failures.append("website-tracked mod 42 was untracked after its local row was deleted")
+
+    own = create_mod({'local_file': 'own.zip', 'mod_id': 7, 'file_id': 1, 'game': 'g'})
+    sync_tracked(client)
+    delete_mod(own['id'])
+    sync_tracked(client)
+    if ('untrack', 'g', 7) not in client.calls:
+        failures.append("mod 7 tracked by the app was not untracked after deletion")
+
+    print("calls:", client.calls)
+    for failure in failures:
+        print("FAIL:", failure)
+    if failures:
+        sys.exit(1)
+    print("ok")
+
+if __name__ == "__main__":
+    main()
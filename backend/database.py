@@ -3,12 +3,10 @@ SQLite database setup and operations
 """
 import sqlite3
 import os
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
 from contextlib import contextmanager
-from dotenv import load_dotenv
-
-load_dotenv()
+import db_profiler
 
 # Store database at same level as Mods folder
 MODS_DIR = os.getenv("MODS_DIR", "")
@@ -19,10 +17,31 @@ else:
     # Fallback to current directory if MODS_DIR not set
     DB_PATH = "tracker.db"
 
+# How long change-feed events are kept before clients must do a full resync
+MOD_EVENTS_RETENTION_DAYS = int(os.getenv("MOD_EVENTS_RETENTION_DAYS", "30"))
+_PRUNE_EVERY = 500
+
+# Called as fn(op, mod_db_ids) after a mods write commits; op is insert, update or delete
+_write_listeners: List[Callable[[str, List[int]], None]] = []
+
+def add_write_listener(fn: Callable[[str, List[int]], None]):
+    """Subscribe to committed writes on the mods table"""
+    _write_listeners.append(fn)
+
+def _notify(op: str, mod_db_ids: List[int]):
+    for fn in _write_listeners:
+        try:
+            fn(op, mod_db_ids)
+        except Exception as e:
+            print(f"[db] Write listener {fn.__name__} failed: {e}")
+
 @contextmanager
 def get_db():
     """Get database connection context manager"""
-    conn = sqlite3.connect(DB_PATH)
+    if db_profiler.is_enabled():
+        conn = sqlite3.connect(DB_PATH, factory=db_profiler.ProfiledConnection)
+    else:
+        conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     try:
         yield conn
@@ -72,8 +91,8 @@ def _migrate_schema(conn):
         """)
         conn.execute("DROP TABLE mods")
         conn.execute("ALTER TABLE mods_new RENAME TO mods")
-        # Refresh cols after migration — new table has all columns
-        return
+        # Refresh cols and fall through to add the columns added since
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(mods)").fetchall()}
 
     # Add any missing new columns to an already-migrated schema
     if 'file_name' not in cols:
@@ -98,44 +117,239 @@ def _migrate_schema(conn):
     if 'uq_mod_file' not in existing_indexes:
         conn.execute("CREATE UNIQUE INDEX uq_mod_file ON mods (mod_id, file_id)")
 
+# Columns indexed by the mods_fts full-text table, in bm25 weight order
+FTS_COLUMNS = ('mod_name', 'author', 'name', 'file_name', 'description', 'local_file')
+FTS_WEIGHTS = (10.0, 5.0, 8.0, 3.0, 1.0, 4.0)
+
+def _ensure_fts(conn):
+    """Create the mods_fts index and its sync triggers, rebuilding if either was missing"""
+    existing = {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE name IN ('mods_fts', 'mods_ai', 'mods_ad', 'mods_au')"
+        ).fetchall()
+    }
+    if len(existing) == 4:
+        return
+
+    cols = ", ".join(FTS_COLUMNS)
+    new_cols = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_cols = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+
+    # External-content table: the text lives in mods, the index in mods_fts
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS mods_fts USING fts5(
+            {cols},
+            content='mods', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS mods_ai AFTER INSERT ON mods BEGIN
+            INSERT INTO mods_fts (rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS mods_ad AFTER DELETE ON mods BEGIN
+            INSERT INTO mods_fts (mods_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END
+    """)
+    # Only re-index when an indexed column changes; update checks touch other columns
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS mods_au AFTER UPDATE OF {cols} ON mods BEGIN
+            INSERT INTO mods_fts (mods_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            INSERT INTO mods_fts (rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+    """)
+    conn.execute("INSERT INTO mods_fts (mods_fts) VALUES ('rebuild')")
+
+def _ensure_events(conn):
+    """Create the mod_events change log used by the /changes feed"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS mod_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mod_db_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_mod_events_created ON mod_events (created_at)")
+
+def _prune_events(conn):
+    """Drop change-feed events older than the retention window"""
+    cutoff = (datetime.utcnow() - timedelta(days=MOD_EVENTS_RETENTION_DAYS)).strftime("%Y-%m-%d %H:%M:%S")
+    conn.execute("DELETE FROM mod_events WHERE created_at < ?", (cutoff,))
+
+def _record_event(conn, mod_db_id: int, op: str):
+    """Append a change-feed event; op is insert, update, delete or update_available"""
+    cursor = conn.execute(
+        "INSERT INTO mod_events (mod_db_id, op) VALUES (?, ?)", (mod_db_id, op)
+    )
+    if cursor.lastrowid % _PRUNE_EVERY == 0:
+        _prune_events(conn)
+
+def _ensure_file_hashes(conn):
+    """Create the content-hash cache used by the duplicate finder"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS file_hashes (
+            filename TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            partial_hash TEXT,
+            full_hash TEXT
+        )
+    """)
+
+def _ensure_update_history(conn):
+    """Create the per-mod file upload history used by the check scheduler"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS mod_update_history (
+            game TEXT NOT NULL,
+            mod_id INTEGER NOT NULL,
+            file_id INTEGER NOT NULL,
+            uploaded_at INTEGER NOT NULL,
+            observed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (game, mod_id, file_id)
+        )
+    """)
+
+def _ensure_jobs(conn):
+    """Create the background jobs table"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            params TEXT,
+            progress_done INTEGER DEFAULT 0,
+            progress_total INTEGER,
+            result TEXT,
+            error TEXT,
+            cancel_requested BOOLEAN DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_status ON jobs (status)")
+
+def _ensure_updated_catalog(conn):
+    """Create the local mirror of Nexusmods' per-game updated-mods feed"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS nexus_updated_mods (
+            game TEXT NOT NULL,
+            mod_id INTEGER NOT NULL,
+            latest_file_update INTEGER,
+            latest_mod_activity INTEGER,
+            PRIMARY KEY (game, mod_id)
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS ix_nexus_updated_file
+        ON nexus_updated_mods (game, latest_file_update)
+    """)
+    # Per game: the mirror holds every update in [covered_since, synced_at]
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS nexus_catalog_sync (
+            game TEXT PRIMARY KEY,
+            covered_since INTEGER NOT NULL,
+            synced_at INTEGER NOT NULL
+        )
+    """)
+
+def _ensure_api_cache(conn):
+    """Create the cache of Nexusmods passthrough responses"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS nexus_api_cache (
+            key TEXT PRIMARY KEY,
+            payload TEXT NOT NULL,
+            fetched_at INTEGER NOT NULL
+        )
+    """)
+
+def _ensure_tracked(conn):
+    """Create the local copy of the user's Nexusmods tracked list"""
+    # managed = tracked because of a local mod, so it may be untracked when that mod goes
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS nexus_tracked (
+            game TEXT NOT NULL,
+            mod_id INTEGER NOT NULL,
+            managed BOOLEAN DEFAULT 0,
+            PRIMARY KEY (game, mod_id)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS nexus_tracked_sync (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            pulled_at INTEGER NOT NULL
+        )
+    """)
+
+def _create_mods_table(conn):
+    """Create the mods table, or bring a pre-versioning one up to date"""
+    existing = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name='mods'"
+    ).fetchone()
+
+    if existing:
+        _migrate_schema(conn)
+    else:
+        conn.execute("""
+            CREATE TABLE mods (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                local_file TEXT NOT NULL UNIQUE,
+                mod_id INTEGER NOT NULL,
+                file_id INTEGER NOT NULL,
+                game TEXT NOT NULL,
+                name TEXT,
+                file_name TEXT,
+                description TEXT,
+                size_in_bytes INTEGER,
+                latest_file_id INTEGER,
+                latest_version TEXT,
+                latest_file_name TEXT,
+                local_file_mtime TIMESTAMP,
+                version TEXT,
+                mod_name TEXT,
+                author TEXT,
+                category_name TEXT,
+                uploaded_time TEXT,
+                last_checked TIMESTAMP,
+                update_available BOOLEAN DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(mod_id, file_id)
+            )
+        """)
+
+# Schema migrations, applied in order. PRAGMA user_version records how many
+# have run, so an up-to-date database skips all introspection on startup.
+# Append new steps; never reorder or edit released ones. Every step is
+# idempotent, because databases created before versioning start at 0.
+MIGRATIONS = [
+    _create_mods_table,
+    _ensure_fts,
+    _ensure_events,
+    _ensure_file_hashes,
+    _ensure_update_history,
+    _ensure_jobs,
+    _ensure_updated_catalog,
+    _ensure_api_cache,
+    _ensure_tracked,
+]
+
 def init_db():
-    """Initialize database tables"""
+    """Initialize database tables, running any pending migrations"""
     with get_db() as conn:
-        # Check if table already exists
-        existing = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='mods'"
-        ).fetchone()
-
-        if existing:
-            _migrate_schema(conn)
-        else:
-            conn.execute("""
-                CREATE TABLE mods (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    local_file TEXT NOT NULL UNIQUE,
-                    mod_id INTEGER NOT NULL,
-                    file_id INTEGER NOT NULL,
-                    game TEXT NOT NULL,
-                    name TEXT,
-                    file_name TEXT,
-                    description TEXT,
-                    size_in_bytes INTEGER,
-                    latest_file_id INTEGER,
-                    latest_version TEXT,
-                    latest_file_name TEXT,
-                    local_file_mtime TIMESTAMP,
-                    version TEXT,
-                    mod_name TEXT,
-                    author TEXT,
-                    category_name TEXT,
-                    uploaded_time TEXT,
-                    last_checked TIMESTAMP,
-                    update_available BOOLEAN DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(mod_id, file_id)
-                )
-            """)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            conn.execute("BEGIN")
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+            print(f"[db] Applied migration {number}: {migration.__name__}")
+        _prune_events(conn)
         conn.commit()
 
 def get_all_mods() -> List[dict]:
@@ -144,6 +358,15 @@ def get_all_mods() -> List[dict]:
         rows = conn.execute("SELECT * FROM mods ORDER BY updated_at DESC").fetchall()
         return [dict(row) for row in rows]
 
+def get_mod_rows(columns: List[str], mod_db_ids: Optional[List[int]] = None) -> List[tuple]:
+    """Get selected columns of all mods (or of the given ids) as plain tuples"""
+    query = f"SELECT {', '.join(columns)} FROM mods"
+    with get_db() as conn:
+        if mod_db_ids is None:
+            return conn.execute(query + " ORDER BY updated_at DESC").fetchall()
+        placeholders = ", ".join("?" * len(mod_db_ids))
+        return conn.execute(query + f" WHERE id IN ({placeholders})", mod_db_ids).fetchall()
+
 def get_mod_by_id(mod_db_id: int) -> Optional[dict]:
     """Get mod by database ID"""
     with get_db() as conn:
@@ -156,34 +379,136 @@ def get_mod_by_local_file(local_file: str) -> Optional[dict]:
         row = conn.execute("SELECT * FROM mods WHERE local_file = ?", (local_file,)).fetchone()
         return dict(row) if row else None
 
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every term must match as a prefix"""
+    terms = [t for t in "".join(c if c.isalnum() else " " for c in query).split() if t]
+    return " ".join(f'"{t}"*' for t in terms)
+
+def search_mods(query: str, limit: int = 50) -> List[dict]:
+    """Full-text search over tracked mods, best matches first"""
+    match = _fts_query(query)
+    if not match:
+        return []
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    with get_db() as conn:
+        rows = conn.execute(f"""
+            SELECT mods.*,
+                   bm25(mods_fts, {weights}) AS rank,
+                   snippet(mods_fts, -1, '<mark>', '</mark>', '…', 12) AS snippet
+            FROM mods_fts
+            JOIN mods ON mods.id = mods_fts.rowid
+            WHERE mods_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        """, (match, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+def _insert_mod(conn, mod_data: dict) -> int:
+    """Insert one mod row plus its change-feed event; returns the new id"""
+    cursor = conn.execute("""
+        INSERT INTO mods (
+            local_file, mod_id, file_id, game,
+            name, file_name, description, size_in_bytes,
+            version, mod_name, author, category_name, uploaded_time,
+            local_file_mtime
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        mod_data['local_file'],
+        mod_data['mod_id'],
+        mod_data['file_id'],
+        mod_data['game'],
+        mod_data.get('name'),
+        mod_data.get('file_name'),
+        mod_data.get('description'),
+        mod_data.get('size_in_bytes'),
+        mod_data.get('version'),
+        mod_data.get('mod_name'),
+        mod_data.get('author'),
+        mod_data.get('category_name'),
+        mod_data.get('uploaded_time'),
+        mod_data.get('local_file_mtime'),
+    ))
+    _record_event(conn, cursor.lastrowid, 'insert')
+    return cursor.lastrowid
+
 def create_mod(mod_data: dict) -> dict:
     """Create a new tracked mod"""
     with get_db() as conn:
-        cursor = conn.execute("""
-            INSERT INTO mods (
-                local_file, mod_id, file_id, game,
-                name, file_name, description, size_in_bytes,
-                version, mod_name, author, category_name, uploaded_time,
-                local_file_mtime
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            mod_data['local_file'],
-            mod_data['mod_id'],
-            mod_data['file_id'],
-            mod_data['game'],
-            mod_data.get('name'),
-            mod_data.get('file_name'),
-            mod_data.get('description'),
-            mod_data.get('size_in_bytes'),
-            mod_data.get('version'),
-            mod_data.get('mod_name'),
-            mod_data.get('author'),
-            mod_data.get('category_name'),
-            mod_data.get('uploaded_time'),
-            mod_data.get('local_file_mtime'),
-        ))
-        conn.commit()
-        return get_mod_by_id(cursor.lastrowid)
+        mod_db_id = _insert_mod(conn, mod_data)
+        conn.commit()
+    _notify('insert', [mod_db_id])
+    return get_mod_by_id(mod_db_id)
+
+def create_mods(mods_data: List[dict]) -> List[dict]:
+    """
+    Create many tracked mods in a single transaction.
+    Each row gets its own savepoint so a constraint violation only skips that row.
+    Returns one {'mod': row} or {'error': message} per input, in order.
+    """
+    results = []
+    with get_db() as conn:
+        conn.execute("BEGIN")
+        for mod_data in mods_data:
+            conn.execute("SAVEPOINT batch_item")
+            try:
+                results.append({'id': _insert_mod(conn, mod_data)})
+            except sqlite3.IntegrityError as e:
+                conn.execute("ROLLBACK TO batch_item")
+                results.append({'error': str(e)})
+            conn.execute("RELEASE batch_item")
+        conn.commit()
+
+        ids = [r['id'] for r in results if 'id' in r]
+        if ids:
+            _notify('insert', ids)
+        rows = {}
+        if ids:
+            placeholders = ", ".join("?" * len(ids))
+            rows = {
+                row['id']: dict(row) for row in conn.execute(
+                    f"SELECT * FROM mods WHERE id IN ({placeholders})", ids
+                ).fetchall()
+            }
+    return [{'mod': rows[r['id']]} if 'id' in r else r for r in results]
+
+def get_mods_page(after_id: int, limit: int) -> List[sqlite3.Row]:
+    """Mods with id > after_id in id order; keyset paging keeps each read short"""
+    with get_db() as conn:
+        return conn.execute(
+            "SELECT * FROM mods WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+        ).fetchall()
+
+def get_mod_columns() -> List[str]:
+    """Column names of the mods table, in table order"""
+    with get_db() as conn:
+        return [row[1] for row in conn.execute("PRAGMA table_info(mods)")]
+
+def import_mods(rows: List[dict], columns: List[str]) -> dict:
+    """
+    Insert exported mod rows in one transaction, skipping any that collide
+    with an existing (mod_id, file_id) or local_file. `columns` is the
+    subset of mods columns to copy (never id). Keys a row lacks or leaves
+    NULL are left out of its INSERT, so column defaults (created_at,
+    updated_at, update_available) still apply. Returns inserted/skipped counts.
+    """
+    queries = {}
+    ids = []
+    with get_db() as conn:
+        conn.execute("BEGIN")
+        for row in rows:
+            present = tuple(c for c in columns if row.get(c) is not None)
+            query = queries.get(present)
+            if query is None:
+                placeholders = ", ".join("?" * len(present))
+                query = queries[present] = f"INSERT OR IGNORE INTO mods ({', '.join(present)}) VALUES ({placeholders})"
+            cursor = conn.execute(query, [row[c] for c in present])
+            if cursor.rowcount == 1:
+                _record_event(conn, cursor.lastrowid, 'insert')
+                ids.append(cursor.lastrowid)
+        conn.commit()
+    if ids:
+        _notify('insert', ids)
+    return {'inserted': len(ids), 'skipped': len(rows) - len(ids)}
 
 def update_mod(mod_db_id: int, updates: dict) -> Optional[dict]:
     """Update a tracked mod"""
@@ -193,13 +518,323 @@ def update_mod(mod_db_id: int, updates: dict) -> Optional[dict]:
     values = list(updates.values()) + [mod_db_id]
 
     with get_db() as conn:
-        conn.execute(f"UPDATE mods SET {set_clause} WHERE id = ?", values)
+        was_available = None
+        if updates.get('update_available'):
+            row = conn.execute("SELECT update_available FROM mods WHERE id = ?", (mod_db_id,)).fetchone()
+            was_available = bool(row[0]) if row else None
+        cursor = conn.execute(f"UPDATE mods SET {set_clause} WHERE id = ?", values)
+        if cursor.rowcount:
+            _record_event(conn, mod_db_id, 'update')
+            if was_available is False:
+                _record_event(conn, mod_db_id, 'update_available')
         conn.commit()
-        return get_mod_by_id(mod_db_id)
+    if cursor.rowcount:
+        _notify('update', [mod_db_id])
+    return get_mod_by_id(mod_db_id)
 
 def delete_mod(mod_db_id: int) -> bool:
     """Delete a tracked mod"""
     with get_db() as conn:
         cursor = conn.execute("DELETE FROM mods WHERE id = ?", (mod_db_id,))
+        if cursor.rowcount:
+            _record_event(conn, mod_db_id, 'delete')
+        conn.commit()
+    if cursor.rowcount:
+        _notify('delete', [mod_db_id])
+    return cursor.rowcount > 0
+
+def delete_mods(mod_db_ids: List[int]) -> List[dict]:
+    """Delete many tracked mods in one transaction; returns the deleted rows"""
+    if not mod_db_ids:
+        return []
+    placeholders = ", ".join("?" * len(mod_db_ids))
+    with get_db() as conn:
+        conn.execute("BEGIN")
+        rows = [dict(row) for row in conn.execute(
+            f"SELECT * FROM mods WHERE id IN ({placeholders})", mod_db_ids
+        ).fetchall()]
+        conn.execute(f"DELETE FROM mods WHERE id IN ({placeholders})", mod_db_ids)
+        for row in rows:
+            _record_event(conn, row['id'], 'delete')
+        conn.commit()
+    if rows:
+        _notify('delete', [row['id'] for row in rows])
+    return rows
+
+def update_mods(changes: Dict[int, dict]) -> dict:
+    """
+    Apply per-mod updates in one transaction.
+    Each row gets its own savepoint so a constraint violation only skips that row.
+    Returns {'updated': [ids that existed], 'errors': {id: message}}.
+    Unlike update_mod, no update_available transition events are recorded.
+    """
+    now = datetime.utcnow().isoformat()
+    updated = []
+    errors = {}
+    with get_db() as conn:
+        conn.execute("BEGIN")
+        for mod_db_id, updates in changes.items():
+            updates = {**updates, 'updated_at': now}
+            set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
+            conn.execute("SAVEPOINT batch_item")
+            try:
+                cursor = conn.execute(
+                    f"UPDATE mods SET {set_clause} WHERE id = ?", list(updates.values()) + [mod_db_id]
+                )
+                if cursor.rowcount:
+                    _record_event(conn, mod_db_id, 'update')
+                    updated.append(mod_db_id)
+            except sqlite3.IntegrityError as e:
+                conn.execute("ROLLBACK TO batch_item")
+                errors[mod_db_id] = str(e)
+            conn.execute("RELEASE batch_item")
+        conn.commit()
+    if updated:
+        _notify('update', updated)
+    return {'updated': updated, 'errors': errors}
+
+def get_changes(since: Optional[int], limit: int = 1000) -> dict:
+    """
+    Collapse change-feed events after `since` into per-mod deltas.
+    `reset` is set when the cursor is missing, unknown or older than the
+    retention window; the client should then refetch the full list.
+    """
+    with get_db() as conn:
+        seq_row = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'mod_events'"
+        ).fetchone()
+        head = seq_row[0] if seq_row else 0
+        oldest = conn.execute("SELECT MIN(id) FROM mod_events").fetchone()[0]
+        floor = oldest - 1 if oldest is not None else head
+
+        if since is None or since < floor or since > head:
+            return {'cursor': head, 'reset': True, 'has_more': False,
+                    'upserts': [], 'deletes': [], 'updates_available': []}
+
+        events = conn.execute(
+            "SELECT id, mod_db_id, op FROM mod_events WHERE id > ? ORDER BY id LIMIT ?",
+            (since, limit),
+        ).fetchall()
+
+        touched = {}
+        updates_available = []
+        for event_id, mod_db_id, op in events:
+            touched[mod_db_id] = op
+            if op == 'update_available':
+                updates_available.append(mod_db_id)
+
+        live_ids = [i for i, op in touched.items() if op != 'delete']
+        rows = {}
+        if live_ids:
+            placeholders = ", ".join("?" * len(live_ids))
+            rows = {
+                row['id']: dict(row) for row in conn.execute(
+                    f"SELECT * FROM mods WHERE id IN ({placeholders})", live_ids
+                ).fetchall()
+            }
+
+        return {
+            'cursor': events[-1][0] if events else since,
+            'reset': False,
+            'has_more': len(events) == limit,
+            'upserts': list(rows.values()),
+            # Rows deleted later in the window also count as deletes
+            'deletes': [i for i in touched if i not in rows],
+            'updates_available': [i for i in dict.fromkeys(updates_available) if i in rows],
+        }
+
+
+def get_file_hashes() -> dict:
+    """Get cached file hashes keyed by filename"""
+    with get_db() as conn:
+        rows = conn.execute("SELECT * FROM file_hashes").fetchall()
+        return {row['filename']: dict(row) for row in rows}
+
+def save_file_hashes(entries: List[dict], present: set):
+    """Upsert hash cache entries and drop rows for files no longer on disk"""
+    with get_db() as conn:
+        conn.executemany("""
+            INSERT INTO file_hashes (filename, size, mtime_ns, inode, partial_hash, full_hash)
+            VALUES (:filename, :size, :mtime_ns, :inode, :partial_hash, :full_hash)
+            ON CONFLICT(filename) DO UPDATE SET
+                size = excluded.size, mtime_ns = excluded.mtime_ns, inode = excluded.inode,
+                partial_hash = excluded.partial_hash, full_hash = excluded.full_hash
+        """, entries)
+        stale = [
+            (row[0],) for row in conn.execute("SELECT filename FROM file_hashes").fetchall()
+            if row[0] not in present
+        ]
+        conn.executemany("DELETE FROM file_hashes WHERE filename = ?", stale)
+        conn.commit()
+
+def record_update_history(game: str, mod_id: int, uploads: List[tuple]):
+    """Record (file_id, uploaded_at unix seconds) pairs seen for a mod; known files are ignored"""
+    if not uploads:
+        return
+    with get_db() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO mod_update_history (game, mod_id, file_id, uploaded_at) VALUES (?, ?, ?, ?)",
+            [(game, mod_id, file_id, uploaded_at) for file_id, uploaded_at in uploads],
+        )
+        conn.commit()
+
+def get_update_history() -> dict:
+    """Get upload timestamps per (game, mod_id), oldest first"""
+    history = {}
+    with get_db() as conn:
+        for game, mod_id, uploaded_at in conn.execute(
+            "SELECT game, mod_id, uploaded_at FROM mod_update_history ORDER BY uploaded_at"
+        ):
+            history.setdefault((game, mod_id), []).append(uploaded_at)
+    return history
+
+def create_job(job_id: str, job_type: str, params: Optional[str]) -> dict:
+    """Create a queued job"""
+    with get_db() as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, type, status, params) VALUES (?, ?, 'queued', ?)",
+            (job_id, job_type, params),
+        )
+        conn.commit()
+    return get_job(job_id)
+
+def get_job(job_id: str) -> Optional[dict]:
+    """Get job by ID"""
+    with get_db() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+def list_jobs(job_type: Optional[str] = None, limit: int = 50) -> List[dict]:
+    """List jobs, newest first, without their stored results"""
+    query = "SELECT id, type, status, params, progress_done, progress_total, error, " \
+            "cancel_requested, created_at, started_at, finished_at FROM jobs"
+    args = []
+    if job_type:
+        query += " WHERE type = ?"
+        args.append(job_type)
+    query += " ORDER BY created_at DESC, rowid DESC LIMIT ?"
+    args.append(limit)
+    with get_db() as conn:
+        return [dict(row) for row in conn.execute(query, args).fetchall()]
+
+def get_active_jobs() -> List[dict]:
+    """Get queued and running jobs, oldest first"""
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT * FROM jobs WHERE status IN ('queued', 'running') ORDER BY created_at, rowid"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+def update_job(job_id: str, updates: dict):
+    """Update a job"""
+    set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
+    with get_db() as conn:
+        conn.execute(f"UPDATE jobs SET {set_clause} WHERE id = ?", list(updates.values()) + [job_id])
+        conn.commit()
+
+def get_catalog_sync(game: str) -> Optional[dict]:
+    """Get the updated-mods mirror coverage for a game"""
+    with get_db() as conn:
+        row = conn.execute("SELECT * FROM nexus_catalog_sync WHERE game = ?", (game,)).fetchone()
+        return dict(row) if row else None
+
+def merge_updated_catalog(game: str, entries: List[dict], window_start: int, synced_at: int):
+    """
+    Merge one updated-mods feed response (covering [window_start, synced_at])
+    into the mirror, keeping the newest timestamps per mod
+    """
+    with get_db() as conn:
+        conn.executemany("""
+            INSERT INTO nexus_updated_mods (game, mod_id, latest_file_update, latest_mod_activity)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(game, mod_id) DO UPDATE SET
+                latest_file_update = MAX(COALESCE(latest_file_update, 0), COALESCE(excluded.latest_file_update, 0)),
+                latest_mod_activity = MAX(COALESCE(latest_mod_activity, 0), COALESCE(excluded.latest_mod_activity, 0))
+        """, [
+            (game, e['mod_id'], e.get('latest_file_update'), e.get('latest_mod_activity'))
+            for e in entries if e.get('mod_id')
+        ])
+        previous = conn.execute(
+            "SELECT covered_since, synced_at FROM nexus_catalog_sync WHERE game = ?", (game,)
+        ).fetchone()
+        # Extend the covered range only if this window overlaps the previous one
+        if previous and window_start <= previous['synced_at']:
+            covered_since = min(previous['covered_since'], window_start)
+        else:
+            covered_since = window_start
+        conn.execute("""
+            INSERT INTO nexus_catalog_sync (game, covered_since, synced_at) VALUES (?, ?, ?)
+            ON CONFLICT(game) DO UPDATE SET
+                covered_since = excluded.covered_since, synced_at = excluded.synced_at
+        """, (game, covered_since, synced_at))
+        conn.commit()
+
+def get_catalog_entries(game: str, mod_ids: Optional[List[int]] = None,
+                        updated_since: Optional[int] = None) -> dict:
+    """Get mirror entries for a game keyed by mod_id, optionally filtered"""
+    query = "SELECT mod_id, latest_file_update, latest_mod_activity FROM nexus_updated_mods WHERE game = ?"
+    args: list = [game]
+    if updated_since is not None:
+        query += " AND latest_file_update > ?"
+        args.append(updated_since)
+    if mod_ids is not None:
+        query += f" AND mod_id IN ({', '.join('?' * len(mod_ids))})"
+        args.extend(mod_ids)
+    with get_db() as conn:
+        return {row['mod_id']: dict(row) for row in conn.execute(query, args).fetchall()}
+
+def get_api_cache(key: str) -> Optional[dict]:
+    """Get a cached Nexusmods response"""
+    with get_db() as conn:
+        row = conn.execute("SELECT payload, fetched_at FROM nexus_api_cache WHERE key = ?", (key,)).fetchone()
+        return dict(row) if row else None
+
+def set_api_cache(key: str, payload: str, fetched_at: int):
+    """Store a Nexusmods response"""
+    with get_db() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO nexus_api_cache (key, payload, fetched_at) VALUES (?, ?, ?)",
+            (key, payload, fetched_at),
+        )
+        conn.commit()
+
+def get_tracked() -> List[dict]:
+    """Get the stored copy of the Nexusmods tracked list"""
+    with get_db() as conn:
+        rows = conn.execute("SELECT game, mod_id, managed FROM nexus_tracked ORDER BY game, mod_id").fetchall()
+        return [dict(row) for row in rows]
+
+def get_tracked_pulled_at() -> Optional[int]:
+    """When the tracked list was last downloaded (unix seconds)"""
+    with get_db() as conn:
+        row = conn.execute("SELECT pulled_at FROM nexus_tracked_sync WHERE id = 1").fetchone()
+        return row['pulled_at'] if row else None
+
+def replace_tracked(keys: set, pulled_at: int) -> dict:
+    """
+    Reconcile the stored tracked list with a freshly downloaded one, touching
+    only rows that differ. Returns the added and removed (game, mod_id) keys.
+    """
+    with get_db() as conn:
+        existing = {(row[0], row[1]) for row in conn.execute("SELECT game, mod_id FROM nexus_tracked")}
+        added = keys - existing
+        removed = existing - keys
+        conn.executemany("INSERT INTO nexus_tracked (game, mod_id) VALUES (?, ?)", sorted(added))
+        conn.executemany("DELETE FROM nexus_tracked WHERE game = ? AND mod_id = ?", sorted(removed))
+        conn.execute(
+            "INSERT OR REPLACE INTO nexus_tracked_sync (id, pulled_at) VALUES (1, ?)", (pulled_at,)
+        )
+        conn.commit()
+        return {'added': added, 'removed': removed}
+
+def set_tracked(game: str, mod_id: int, tracked: bool, managed: bool = True):
+    """Record one track/untrack that was pushed to Nexusmods"""
+    with get_db() as conn:
+        if tracked:
+            conn.execute("""
+                INSERT INTO nexus_tracked (game, mod_id, managed) VALUES (?, ?, ?)
+                ON CONFLICT(game, mod_id) DO UPDATE SET managed = excluded.managed
+            """, (game, mod_id, managed))
+        else:
+            conn.execute("DELETE FROM nexus_tracked WHERE game = ? AND mod_id = ?", (game, mod_id))
         conn.commit()
-        return cursor.rowcount > 0
@@ -0,0 +1,225 @@
+"""
+Optional SQLite statement profiler.
+
+When enabled, get_db() opens ProfiledConnection instead of a plain
+connection. Each statement's execute and fetch calls are timed, and a
+progress handler counts VM steps, which shows full scans and sorts. Each
+statement that takes longer than the threshold is logged. Its EXPLAIN QUERY
+PLAN is taken the first time it is slow. When profiling is disabled, the
+only cost is one flag check per connection.
+"""
+import os
+import re
+import sqlite3
+import threading
+from time import perf_counter
+from typing import Dict, Optional
+
+# VM instructions between progress handler calls; steps are reported in these units
+STEP_GRANULARITY = 1000
+
+_enabled = os.getenv("DB_PROFILE", "").lower() in ("1", "true", "yes")
+_slow_ms = float(os.getenv("DB_SLOW_QUERY_MS", "100"))
+
+_stats: Dict[str, dict] = {}
+_lock = threading.Lock()
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN (?, ?, ...) lists would otherwise give one entry per list length
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+def is_enabled() -> bool:
+    return _enabled
+
+def configure(enabled: bool, slow_query_ms: Optional[float] = None):
+    """Turn profiling on or off for connections opened from now on"""
+    global _enabled, _slow_ms
+    _enabled = enabled
+    if slow_query_ms is not None:
+        _slow_ms = slow_query_ms
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+def normalize(sql: str) -> str:
+    return _PLACEHOLDER_LIST.sub("?, ...", _WHITESPACE.sub(" ", sql).strip())
+
+def _explain(conn, sql: str, params) -> Optional[list]:
+    if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    try:
+        rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, params).fetchall()
+        return [row[3] for row in rows]
+    except sqlite3.Error as e:
+        return [f"(explain failed: {e})"]
+
+def _record(conn, cursor):
+    """Add a finished statement to the stats, logging it if it was slow"""
+    key = cursor._key
+    elapsed_ms = cursor._elapsed * 1000
+    slow = elapsed_ms >= _slow_ms
+    with _lock:
+        entry = _stats.get(key)
+        if entry is None:
+            entry = _stats[key] = {
+                "sql": key, "calls": 0, "total_ms": 0.0, "max_ms": 0.0,
+                "rows": 0, "vm_steps": 0, "slow_calls": 0, "plan": None,
+            }
+        entry["calls"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["rows"] += cursor._rows
+        entry["vm_steps"] += cursor._steps * STEP_GRANULARITY
+        if slow:
+            entry["slow_calls"] += 1
+        need_plan = slow and entry["plan"] is None
+    if not slow:
+        return
+    plan = entry["plan"]
+    if need_plan and cursor._params is not None:
+        plan = _explain(conn, cursor._sql, cursor._params)
+        with _lock:
+            entry["plan"] = plan
+    print(f"[db] Slow query {elapsed_ms:.1f}ms ({cursor._rows} rows, ~{cursor._steps * STEP_GRANULARITY} steps): {key}")
+    for line in plan or []:
+        print(f"[db]   plan: {line}")
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Times execute plus all fetches until the result set is exhausted"""
+
+    _key = None
+
+    def _start(self, sql, params):
+        if self._key is not None:
+            self._finish()
+        self._key = normalize(sql)
+        self._sql = sql
+        self._params = params
+        self._elapsed = 0.0
+        self._rows = 0
+        self._steps = 0
+        self.connection._pending.add(self)
+
+    def _finish(self):
+        if self._key is None:
+            return
+        self.connection._pending.discard(self)
+        try:
+            _record(self.connection, self)
+        finally:
+            self._key = None
+
+    def _timed(self, fn, *args):
+        conn = self.connection
+        ticks = conn._ticks
+        start = perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._elapsed += perf_counter() - start
+            self._steps += conn._ticks - ticks
+
+    def execute(self, sql, params=()):
+        self._start(sql, params)
+        try:
+            self._timed(super().execute, sql, params)
+        except Exception:
+            self._finish()
+            raise
+        if self.description is None:
+            self._rows = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        # Parameters may be a one-shot iterator, so no plan is taken
+        self._start(sql, None)
+        try:
+            self._timed(super().executemany, sql, seq_of_params)
+        finally:
+            self._rows = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._finish()
+        elif self._key is not None:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        rows = self._timed(super().fetchmany, size)
+        if self._key is not None:
+            self._rows += len(rows)
+            if len(rows) < size:
+                self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._key is not None:
+            self._rows += len(rows)
+            self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+        if self._key is not None:
+            self._rows += 1
+        return row
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection whose cursors report to the profiler"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._ticks = 0
+        # Cursors whose result set has not been read to the end yet;
+        # recorded on close if the caller never finishes them
+        self._pending = set()
+        self.set_progress_handler(self._tick, STEP_GRANULARITY)
+
+    def _tick(self):
+        self._ticks += 1
+        return 0
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+    def close(self):
+        for cursor in list(self._pending):
+            cursor._finish()
+        super().close()
+
+def summary(limit: int = 50) -> dict:
+    """Statements ordered by total time spent"""
+    with _lock:
+        entries = [dict(e) for e in _stats.values()]
+    entries.sort(key=lambda e: e["total_ms"], reverse=True)
+    for e in entries:
+        e["avg_ms"] = round(e["total_ms"] / e["calls"], 3) if e["calls"] else 0.0
+        e["total_ms"] = round(e["total_ms"], 3)
+        e["max_ms"] = round(e["max_ms"], 3)
+    return {
+        "enabled": _enabled,
+        "slow_query_ms": _slow_ms,
+        "statements": len(entries),
+        "total_calls": sum(e["calls"] for e in entries),
+        "total_ms": round(sum(e["total_ms"] for e in entries), 3),
+        "top": entries[:limit],
+    }
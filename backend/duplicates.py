@@ -0,0 +1,154 @@
+"""
+Duplicate archive detection for MODS_DIR.
+
+Files are narrowed down in three passes so most bytes are never read:
+  1. group by size (a stat, no reads)
+  2. hash the first and last PARTIAL_CHUNK bytes of same-size files
+  3. hash the full contents only for files whose partial hashes collide
+Hashes are cached in the file_hashes table against (size, mtime, inode).
+Hard links to one inode are collapsed to a single file first. Deleting one of
+them frees nothing, so they never count as duplicates or as reclaimable space.
+"""
+import hashlib
+import os
+from typing import Dict, List, Optional
+from database import get_file_hashes, save_file_hashes
+
+ARCHIVE_EXTENSIONS = ('.zip', '.rar', '.7z')
+PARTIAL_CHUNK = 64 * 1024
+READ_CHUNK = 1024 * 1024
+
+def _partial_hash(path: str, size: int) -> str:
+    """Hash the head and tail of a file"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        h.update(f.read(PARTIAL_CHUNK))
+        if size > 2 * PARTIAL_CHUNK:
+            f.seek(-PARTIAL_CHUNK, os.SEEK_END)
+            h.update(f.read(PARTIAL_CHUNK))
+        elif size > PARTIAL_CHUNK:
+            h.update(f.read())
+    return h.hexdigest()
+
+def _full_hash(path: str) -> str:
+    """Hash the whole file"""
+    h = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb') as f:
+        while chunk := f.read(READ_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _group(items: List[dict], key: str) -> List[List[dict]]:
+    """Group items by key, keeping only groups with more than one member"""
+    groups: Dict[object, List[dict]] = {}
+    for item in items:
+        groups.setdefault(item[key], []).append(item)
+    return [g for g in groups.values() if len(g) > 1]
+
+def find_duplicates(mods_dir: str, tracked: Optional[Dict[str, int]] = None) -> dict:
+    """
+    Find groups of byte-identical archives in mods_dir.
+    `tracked` maps local_file -> mods.id so each file can be flagged as tracked.
+    """
+    tracked = tracked or {}
+    cache = get_file_hashes()
+
+    files = []
+    with os.scandir(mods_dir) as entries:
+        for entry in entries:
+            if not entry.is_file() or not entry.name.endswith(ARCHIVE_EXTENSIONS):
+                continue
+            st = entry.stat()
+            item = {
+                'filename': entry.name, 'path': entry.path,
+                'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'inode': st.st_ino,
+                'partial_hash': None, 'full_hash': None,
+                # st_nlink is 0 from scandir on Windows, so links are only collapsed on POSIX
+                'link_key': (st.st_dev, st.st_ino) if st.st_nlink > 1 else None,
+                'hard_links': [],
+            }
+            cached = cache.get(entry.name)
+            if cached and (cached['size'], cached['mtime_ns'], cached['inode']) == (
+                item['size'], item['mtime_ns'], item['inode']
+            ):
+                item['partial_hash'] = cached['partial_hash']
+                item['full_hash'] = cached['full_hash']
+            files.append(item)
+
+    # One entry per inode, named after a tracked link if there is one
+    unique = []
+    by_inode = {}
+    for item in sorted(files, key=lambda f: (f['filename'] not in tracked, f['filename'])):
+        first = by_inode.get(item['link_key'])
+        if first is not None:
+            first['hard_links'].append(item['filename'])
+            continue
+        if item['link_key'] is not None:
+            by_inode[item['link_key']] = item
+        unique.append(item)
+
+    bytes_read = 0
+    dirty = {}
+
+    candidates = [f for group in _group(unique, 'size') for f in group]
+    for item in candidates:
+        if item['partial_hash'] is None:
+            item['partial_hash'] = _partial_hash(item['path'], item['size'])
+            bytes_read += min(item['size'], 2 * PARTIAL_CHUNK)
+            dirty[item['filename']] = item
+
+    for item in candidates:
+        item['partial_key'] = (item['size'], item['partial_hash'])
+    survivors = [f for group in _group(candidates, 'partial_key') for f in group]
+
+    for item in survivors:
+        if item['full_hash'] is None:
+            # The partial hash already covers the whole file for small archives
+            if item['size'] <= 2 * PARTIAL_CHUNK:
+                item['full_hash'] = item['partial_hash']
+            else:
+                item['full_hash'] = _full_hash(item['path'])
+                bytes_read += item['size']
+            dirty[item['filename']] = item
+
+    for item in survivors:
+        item['content_key'] = (item['size'], item['full_hash'])
+
+    save_file_hashes(
+        [{k: item[k] for k in ('filename', 'size', 'mtime_ns', 'inode', 'partial_hash', 'full_hash')}
+         for item in dirty.values()],
+        {f['filename'] for f in files},
+    )
+
+    groups = []
+    for group in _group(survivors, 'content_key'):
+        # Keep a tracked copy if there is one, otherwise the newest
+        group.sort(key=lambda f: (f['filename'] not in tracked, -f['mtime_ns'], f['filename']))
+        size = group[0]['size']
+        groups.append({
+            'size_bytes': size,
+            'hash': group[0]['full_hash'],
+            'reclaimable_bytes': size * (len(group) - 1),
+            'keep': group[0]['filename'],
+            'files': [
+                {
+                    'filename': f['filename'],
+                    'tracked': f['filename'] in tracked,
+                    'mod_db_id': tracked.get(f['filename']),
+                    'hard_links': f['hard_links'],
+                }
+                for f in group
+            ],
+        })
+    groups.sort(key=lambda g: g['reclaimable_bytes'], reverse=True)
+
+    return {
+        'scanned_files': len(files),
+        'hard_linked_files': len(files) - len(unique),
+        'size_candidates': len(candidates),
+        'hashed_candidates': len(survivors),
+        'bytes_read': bytes_read,
+        'duplicate_groups': len(groups),
+        'reclaimable_bytes': sum(g['reclaimable_bytes'] for g in groups),
+        'groups': groups,
+    }
@@ -0,0 +1,170 @@
+"""
+Server-sent invalidation events.
+
+Writers call publish() from any thread. The event is appended to a shared
+ring buffer and a single wake-up is scheduled on the event loop, however
+many clients are connected. Each stream then reads what it missed from the
+buffer, merges it into one message per event type and sends it. A client
+that falls further behind than the buffer reaches gets a `resync`.
+
+Event ids are "<epoch>-<seq>", where the epoch is fixed for each process.
+A Last-Event-ID from an earlier process (seq restarts at 0 on boot) or one
+ahead of the current seq can't be resumed from, so it also gets a `resync`.
+
+Event types:
+- mods: mod rows were written; data {"ops": [...], "ids": [...] or null (too many to list)}
+- update: an update check found new files; data {"ids": [...]}
+- local_files: the contents of MODS_DIR changed
+"""
+import asyncio
+import json
+import os
+import secrets
+import threading
+from collections import deque
+from typing import AsyncIterator, Optional
+from database import add_write_listener
+
+BACKLOG = 512
+# Wait this long after a wake-up so a burst of writes goes out as one message
+COALESCE_SECONDS = 0.2
+HEARTBEAT_SECONDS = 15
+# Merged id lists longer than this are sent as null ("revalidate everything")
+MAX_IDS = 200
+MODS_WATCH_INTERVAL = float(os.getenv("MODS_WATCH_INTERVAL", "2"))
+
+class EventBroker:
+    def __init__(self, backlog: int = BACKLOG):
+        self._lock = threading.Lock()
+        self._buffer = deque(maxlen=backlog)
+        self._seq = 0
+        self.epoch = secrets.token_hex(4)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._closing = False
+        self.subscribers = 0
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._changed = asyncio.Event()
+        self._closing = False
+
+    def stop(self):
+        """End open streams (call on the event loop)"""
+        self._closing = True
+        if self._changed is not None:
+            self._wake()
+
+    def publish(self, event_type: str, **data):
+        """Queue an event for every connected client; safe from any thread"""
+        with self._lock:
+            self._seq += 1
+            self._buffer.append((self._seq, event_type, data))
+        loop = self._loop
+        if loop is not None and self.subscribers:
+            try:
+                loop.call_soon_threadsafe(self._wake)
+            except RuntimeError:
+                pass  # loop already closed
+
+    def _wake(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def _resume_point(self, last_event_id: Optional[str]):
+        """Seq to continue after, and whether the client must resync"""
+        if not last_event_id:
+            return self._seq, False
+        epoch, _, seq = last_event_id.rpartition('-')
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self._seq:
+            return self._seq, True
+        return int(seq), False
+
+    def _since(self, after: int):
+        """Events after `after`, and whether some were already dropped"""
+        with self._lock:
+            if not self._buffer:
+                return [], after < self._seq
+            gap = after < self._buffer[0][0] - 1
+            return [e for e in self._buffer if e[0] > after], gap
+
+    async def stream(self, is_disconnected, last_event_id: Optional[str] = None) -> AsyncIterator[str]:
+        """SSE frames for one client, resuming after Last-Event-ID if it can"""
+        self.subscribers += 1
+        try:
+            after, resync = self._resume_point(last_event_id)
+            yield f"retry: 3000\nid: {self.event_id(after)}\nevent: hello\ndata: {{}}\n\n"
+            if resync:
+                yield f"id: {self.event_id(after)}\nevent: resync\ndata: {{}}\n\n"
+            while not self._closing:
+                changed = self._changed
+                events, gap = self._since(after)
+                if gap:
+                    after = self._seq
+                    yield f"id: {self.event_id(after)}\nevent: resync\ndata: {{}}\n\n"
+                elif events:
+                    after = events[-1][0]
+                    for frame in _merge(events, self.event_id(after)):
+                        yield frame
+                else:
+                    try:
+                        await asyncio.wait_for(changed.wait(), HEARTBEAT_SECONDS)
+                        await asyncio.sleep(COALESCE_SECONDS)
+                    except asyncio.TimeoutError:
+                        yield ": ping\n\n"
+                    if await is_disconnected():
+                        return
+        finally:
+            self.subscribers -= 1
+
+def _merge(events: list, last_id: str) -> list:
+    """One SSE frame per event type, with ids and ops combined"""
+    merged = {}
+    for _, event_type, data in events:
+        entry = merged.setdefault(event_type, {})
+        for key, value in data.items():
+            if isinstance(value, list) or value is None:
+                current = entry.get(key, [])
+                entry[key] = None if value is None or current is None else current + value
+            else:
+                entry[key] = value
+    frames = []
+    for event_type, data in merged.items():
+        for key, value in data.items():
+            if isinstance(value, list):
+                unique = list(dict.fromkeys(value))
+                data[key] = None if key == 'ids' and len(unique) > MAX_IDS else unique
+        frames.append(f"id: {last_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n")
+    return frames
+
+broker = EventBroker()
+
+def _on_mods_write(op: str, mod_db_ids):
+    broker.publish('mods', ops=[op], ids=list(mod_db_ids))
+
+add_write_listener(_on_mods_write)
+
+async def watch_mods_dir():
+    """Publish local_files when MODS_DIR's mtime changes, while anyone is listening"""
+    last = None
+    while True:
+        await asyncio.sleep(MODS_WATCH_INTERVAL)
+        mods_dir = os.getenv("MODS_DIR", "")
+        if not broker.subscribers or not mods_dir:
+            last = None
+            continue
+        try:
+            st = os.stat(mods_dir)
+            current = (st.st_ino, st.st_mtime_ns)
+        except OSError:
+            current = None
+        if last is not None and current != last:
+            broker.publish('local_files')
+        last = current
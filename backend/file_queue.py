@@ -0,0 +1,150 @@
+"""
+Background removal of files from MODS_DIR.
+
+Requests call queue_removal() and return at once. A single worker thread
+handles the queue. When TRASH_RETENTION_HOURS > 0, the worker renames each
+file into MODS_DIR/.trash. That directory is on the same filesystem, so the
+rename is O(1) whatever the file size. Trashed files are purged once they
+are older than the retention period. With retention set to 0, files are
+deleted outright. The queue is in memory; shutdown waits briefly for it to
+drain.
+"""
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+TRASH_RETENTION_HOURS = float(os.getenv("TRASH_RETENTION_HOURS", "24"))
+TRASH_DIRNAME = ".trash"
+PURGE_INTERVAL = 600
+
+# ('remove', filename, reason), ('purge',), or None to stop
+_queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+_stats = {'removed': 0, 'trashed': 0, 'purged': 0, 'failed': 0}
+_last_purge = 0.0
+
+def _mods_dir() -> str:
+    return os.getenv("MODS_DIR", "")
+
+def trash_dir() -> Optional[str]:
+    mods_dir = _mods_dir()
+    return os.path.join(mods_dir, TRASH_DIRNAME) if mods_dir else None
+
+def queue_removal(filename: str, reason: str = "delete"):
+    """Schedule MODS_DIR/filename for removal; returns immediately"""
+    if not filename or os.path.basename(filename) != filename:
+        print(f"[files] Refusing to remove {filename!r}: not a plain filename")
+        return
+    _ensure_worker()
+    _queue.put(('remove', filename, reason))
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name="file-removal", daemon=True)
+            _worker.start()
+
+def _remove(filename: str, reason: str):
+    mods_dir = _mods_dir()
+    if not mods_dir:
+        return
+    path = os.path.join(mods_dir, filename)
+    if not os.path.exists(path):
+        return
+    try:
+        if TRASH_RETENTION_HOURS > 0:
+            trash = trash_dir()
+            os.makedirs(trash, exist_ok=True)
+            os.rename(path, os.path.join(trash, f"{time.time_ns()}-{filename}"))
+            _stats['trashed'] += 1
+            print(f"[files] Moved {filename} to trash ({reason})")
+        else:
+            os.remove(path)
+            _stats['removed'] += 1
+            print(f"[files] Deleted {filename} ({reason})")
+    except OSError as e:
+        _stats['failed'] += 1
+        print(f"[files] Failed to remove {filename}: {e}")
+
+def purge_trash(max_age_hours: Optional[float] = None) -> int:
+    """Delete trashed files older than max_age_hours (default TRASH_RETENTION_HOURS)"""
+    global _last_purge
+    _last_purge = time.monotonic()
+    trash = trash_dir()
+    if not trash or not os.path.isdir(trash):
+        return 0
+    max_age = TRASH_RETENTION_HOURS if max_age_hours is None else max_age_hours
+    cutoff = time.time_ns() - int(max_age * 3600 * 1e9)
+    purged = 0
+    with os.scandir(trash) as entries:
+        for entry in entries:
+            stamp = entry.name.split('-', 1)[0]
+            if stamp.isdigit() and int(stamp) <= cutoff:
+                try:
+                    os.remove(entry.path)
+                    purged += 1
+                except OSError as e:
+                    print(f"[files] Failed to purge {entry.name}: {e}")
+    if purged:
+        _stats['purged'] += purged
+        print(f"[files] Purged {purged} trashed files")
+    return purged
+
+def _purge_if_due():
+    if TRASH_RETENTION_HOURS > 0 and time.monotonic() - _last_purge >= PURGE_INTERVAL:
+        purge_trash()
+
+def _run():
+    while True:
+        try:
+            item = _queue.get(timeout=PURGE_INTERVAL)
+        except queue.Empty:
+            _purge_if_due()
+            continue
+        try:
+            if item is None:
+                return
+            if item[0] == 'remove':
+                _remove(item[1], item[2])
+            elif item[0] == 'purge':
+                purge_trash()
+            _purge_if_due()
+        except Exception as e:
+            print(f"[files] Worker error: {e}")
+        finally:
+            _queue.task_done()
+
+def start():
+    """Start the worker and purge expired trash in the background"""
+    _ensure_worker()
+    if TRASH_RETENTION_HOURS > 0:
+        _queue.put(('purge',))
+
+def shutdown(timeout: float = 5.0):
+    """Let queued removals finish (up to timeout), then stop the worker"""
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.05)
+    _queue.put(None)
+
+def status() -> dict:
+    trash = trash_dir()
+    trashed_files, trashed_bytes = 0, 0
+    if trash and os.path.isdir(trash):
+        with os.scandir(trash) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    trashed_files += 1
+                    trashed_bytes += entry.stat().st_size
+    return {
+        'pending': _queue.qsize(),
+        'trash_enabled': TRASH_RETENTION_HOURS > 0,
+        'retention_hours': TRASH_RETENTION_HOURS,
+        'trash_files': trashed_files,
+        'trash_bytes': trashed_bytes,
+        **_stats,
+    }
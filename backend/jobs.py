@@ -0,0 +1,186 @@
+"""
+Background jobs persisted in SQLite.
+
+Long operations (refresh-all, check-all, cleanup) run on a per-type worker
+pool instead of inside the HTTP request. Job state, progress and results are
+stored in the jobs table so clients can poll them, and jobs left queued or
+running by a restart are re-queued on startup. Handlers are idempotent, so an
+interrupted job simply runs again from the start.
+"""
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+from database import create_job, get_job, get_active_jobs, update_job
+
+# Minimum seconds between progress writes to the jobs table
+_PROGRESS_INTERVAL = 0.5
+
+class JobCancelled(Exception):
+    """Raised inside a handler when its job has been cancelled"""
+
+class JobContext:
+    """Handed to job handlers for reporting progress and observing cancellation"""
+
+    def __init__(self, job_id: str, params: dict):
+        self.id = job_id
+        self.params = params
+        self._cancel = threading.Event()
+        self.user_cancelled = False
+        self._done = 0
+        self._total = None
+        self._last_flush = 0.0
+
+    def cancel(self, user: bool = True):
+        self.user_cancelled = self.user_cancelled or user
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _flush(self, force: bool = False):
+        now = time.monotonic()
+        if force or now - self._last_flush >= _PROGRESS_INTERVAL:
+            self._last_flush = now
+            update_job(self.id, {'progress_done': self._done, 'progress_total': self._total})
+
+    def progress(self, done: int, total: Optional[int] = None, persist: bool = True):
+        """
+        Report progress for work that isn't a simple iteration. With
+        persist=False it is kept in memory (served by live_progress) and only
+        written to the jobs table when the job finishes.
+        """
+        self._done, self._total = done, total
+        if persist:
+            self._flush(force=done == total)
+
+    def track(self, items: Iterable) -> Iterable:
+        """Iterate items, recording progress and stopping if the job is cancelled"""
+        items = list(items)
+        self._done, self._total = 0, len(items)
+        self._flush(force=True)
+        for item in items:
+            if self.cancelled:
+                raise JobCancelled()
+            yield item
+            self._done += 1
+            self._flush()
+        self._flush(force=True)
+
+_handlers: Dict[str, Callable[[JobContext], object]] = {}
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_running: Dict[str, JobContext] = {}
+_lock = threading.RLock()
+_stopping = threading.Event()
+
+def register_job(job_type: str, concurrency: int = 1):
+    """Register a handler for a job type, running at most `concurrency` at once"""
+    def decorator(fn: Callable[[JobContext], object]):
+        _handlers[job_type] = fn
+        _executors[job_type] = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix=f"job-{job_type}"
+        )
+        return fn
+    return decorator
+
+def job_types() -> list:
+    return sorted(_handlers)
+
+def _run(job_id: str, job_type: str, ctx: JobContext):
+    try:
+        if ctx.cancelled:
+            raise JobCancelled()
+        update_job(job_id, {'status': 'running', 'started_at': datetime.utcnow().isoformat()})
+        result = _handlers[job_type](ctx)
+        update_job(job_id, {
+            'status': 'succeeded',
+            'progress_done': ctx._done,
+            'progress_total': ctx._total,
+            'result': json.dumps(result, default=str),
+            'finished_at': datetime.utcnow().isoformat(),
+        })
+    except JobCancelled:
+        if _stopping.is_set() and not ctx.user_cancelled:
+            # Interrupted by shutdown: leave it for resume_jobs on next start
+            update_job(job_id, {'status': 'queued'})
+        else:
+            update_job(job_id, {'status': 'cancelled', 'finished_at': datetime.utcnow().isoformat()})
+    except Exception as e:
+        print(f"[jobs] {job_type} {job_id} failed: {e}")
+        update_job(job_id, {
+            'status': 'failed',
+            'error': str(e),
+            'finished_at': datetime.utcnow().isoformat(),
+        })
+    finally:
+        with _lock:
+            _running.pop(job_id, None)
+
+def live_progress(job: dict) -> dict:
+    """The job row with in-memory progress of a running job filled in"""
+    with _lock:
+        ctx = _running.get(job['id'])
+    if ctx is None or job['status'] != 'running':
+        return job
+    return {**job, 'progress_done': ctx._done, 'progress_total': ctx._total}
+
+def _enqueue(job: dict):
+    params = json.loads(job['params']) if job.get('params') else {}
+    ctx = JobContext(job['id'], params)
+    with _lock:
+        _running[job['id']] = ctx
+    _executors[job['type']].submit(_run, job['id'], job['type'], ctx)
+
+def submit_job(job_type: str, params: Optional[dict] = None) -> dict:
+    """
+    Queue a job and return its row.
+    If an identical job (same type and params) is already queued or running,
+    that job is returned instead of starting a second one.
+    """
+    if job_type not in _handlers:
+        raise ValueError(f"Unknown job type: {job_type}")
+    encoded = json.dumps(params or {}, sort_keys=True)
+    with _lock:
+        for job in get_active_jobs():
+            if job['type'] == job_type and job['params'] == encoded and job['id'] in _running:
+                return job
+        job = create_job(uuid.uuid4().hex, job_type, encoded)
+        _enqueue(job)
+    return job
+
+def cancel_job(job_id: str) -> Optional[dict]:
+    """Request cancellation; queued jobs never start, running ones stop at the next item"""
+    job = get_job(job_id)
+    if not job or job['status'] not in ('queued', 'running'):
+        return job
+    update_job(job_id, {'cancel_requested': True})
+    with _lock:
+        ctx = _running.get(job_id)
+    if ctx:
+        ctx.cancel()
+    else:
+        update_job(job_id, {'status': 'cancelled', 'finished_at': datetime.utcnow().isoformat()})
+    return get_job(job_id)
+
+def resume_jobs():
+    """Re-queue jobs that were queued or running when the backend last stopped"""
+    for job in get_active_jobs():
+        if job['type'] not in _handlers or job['cancel_requested']:
+            update_job(job['id'], {'status': 'cancelled', 'finished_at': datetime.utcnow().isoformat()})
+            continue
+        print(f"[jobs] Resuming {job['type']} {job['id']}")
+        update_job(job['id'], {'status': 'queued', 'progress_done': 0})
+        _enqueue(job)
+
+def shutdown_jobs():
+    """Stop running jobs at their next item; unfinished jobs resume on next start"""
+    _stopping.set()
+    with _lock:
+        for ctx in _running.values():
+            ctx.cancel(user=False)
+    for executor in _executors.values():
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -1,24 +1,40 @@
 """
 Nexusmods Tracker - FastAPI Backend
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from fastapi.responses import StreamingResponse
+from contextlib import asynccontextmanager, suppress
+from typing import Optional
+import asyncio
 import os
-import uvicorn
 from dotenv import load_dotenv
 
+# The only load_dotenv: must run before database.py reads MODS_DIR
 load_dotenv()
 
 from database import init_db
-from routers import mods, local_files, updates, nexusmods_api
+from jobs import resume_jobs, shutdown_jobs
+from events import broker, watch_mods_dir
+import file_queue
+from routers import mods, local_files, updates, nexusmods_api, jobs, stats, db_admin
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     init_db()
+    broker.start(asyncio.get_running_loop())
+    watcher = asyncio.create_task(watch_mods_dir())
+    resume_jobs()
+    file_queue.start()
     yield
-    # Shutdown (cleanup if needed)
+    # Shutdown
+    broker.stop()
+    watcher.cancel()
+    with suppress(asyncio.CancelledError):
+        await watcher
+    shutdown_jobs()
+    file_queue.shutdown()
 
 app = FastAPI(
     title="Nexusmods Tracker API",
@@ -40,6 +56,9 @@ app.include_router(mods.router, prefix="/api/mods", tags=["mods"])
 app.include_router(local_files.router, prefix="/api/local-files", tags=["local-files"])
 app.include_router(updates.router, prefix="/api/updates", tags=["updates"])
 app.include_router(nexusmods_api.router, prefix="/api/nexusmods", tags=["nexusmods"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
+app.include_router(stats.router, prefix="/api/stats", tags=["stats"])
+app.include_router(db_admin.router, prefix="/api/db", tags=["database"])
 
 @app.get("/")
 def root():
@@ -52,9 +71,23 @@ def root():
 def get_config():
     return {"game": os.getenv("GAME", "monsterhunterwilds")}
 
+@app.get("/api/events")
+async def events(request: Request, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-sent events telling the frontend what to revalidate: `mods`,
+    `update`, `local_files`, or `resync` after a gap. Reconnects resume
+    from Last-Event-ID.
+    """
+    return StreamingResponse(
+        broker.stream(request.is_disconnected, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.get("/health")
 def health():
     return {"status": "healthy"}
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,9 +1,9 @@
 """
 Database models and Pydantic schemas
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 
 # Pydantic models for API
 class ModCreate(BaseModel):
@@ -12,6 +12,9 @@ class ModCreate(BaseModel):
     file_id: int
     game: str
 
+class ModBatchCreate(BaseModel):
+    items: List[ModCreate] = Field(..., min_length=1, max_length=1000)
+
 class ModUpdate(BaseModel):
     local_file: Optional[str] = None
     file_id: Optional[int] = None
@@ -44,6 +47,35 @@ class Mod(BaseModel):
     class Config:
         from_attributes = True
 
+class ModSearchResult(Mod):
+    rank: float
+    snippet: Optional[str] = None
+
+class ModBatchItemResult(BaseModel):
+    index: int
+    local_file: str
+    success: bool
+    mod: Optional[Mod] = None
+    error: Optional[str] = None
+
+class ModBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[ModBatchItemResult]
+
+class ModBulkRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+class ModBulkFailure(BaseModel):
+    id: int
+    error: str
+
+class ModBulkResponse(BaseModel):
+    succeeded: List[int]
+    missing: List[int]
+    failed: List[ModBulkFailure] = []
+    files_queued: int = 0
+
 class LocalFile(BaseModel):
     filename: str
     size_bytes: int
@@ -71,6 +103,13 @@ class NexusmodsMod(BaseModel):
     game: str
     updated_time: str
 
+class OfflineMode(BaseModel):
+    offline: bool
+
+class ProfilerSettings(BaseModel):
+    enabled: bool
+    slow_query_ms: Optional[float] = Field(default=None, ge=0)
+
 class NexusmodsFile(BaseModel):
     file_id: int
     name: str
@@ -79,3 +118,20 @@ class NexusmodsFile(BaseModel):
     size_kb: int
     uploaded_time: str
     file_name: str
+
+class JobSubmit(BaseModel):
+    params: dict = {}
+
+class Job(BaseModel):
+    id: str
+    type: str
+    status: str
+    params: Optional[dict] = None
+    progress_done: int = 0
+    progress_total: Optional[int] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,71 @@
+"""
+Cached listing of archives in MODS_DIR.
+
+Adding, removing or renaming a file changes the directory's own mtime, so
+one stat of the directory tells whether the set of files is still valid.
+Overwriting an archive in place does not touch the directory, so each call
+also re-stats the archives already in the listing (no directory read) and
+rescans if any size or mtime moved. A rewrite that keeps both the size and
+the mtime, e.g. two same-size writes within one coarse mtime tick on a
+network mount, is still not noticed until the next change.
+"""
+import itertools
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+ARCHIVE_EXTENSIONS = ('.zip', '.rar', '.7z')
+
+_serial = itertools.count(1)
+
+class DirSnapshot:
+    __slots__ = ('dir_key', 'key', 'files', 'stamps', 'total_bytes')
+
+    def __init__(self, dir_key: tuple, files: Dict[str, Tuple[int, float]], stamps: Dict[str, tuple]):
+        self.dir_key = dir_key
+        # Changes on every rescan, so callers can cache on it
+        self.key = dir_key + (next(_serial),)
+        # filename -> (size_bytes, mtime)
+        self.files = files
+        # filename -> (size_bytes, mtime_ns), compared on each call
+        self.stamps = stamps
+        self.total_bytes = sum(size for size, _ in files.values())
+
+_snapshot: Optional[DirSnapshot] = None
+_lock = threading.Lock()
+
+def _unchanged(mods_dir: str, snapshot: DirSnapshot) -> bool:
+    """Whether every archive in the snapshot still has its recorded size and mtime"""
+    for filename, stamp in snapshot.stamps.items():
+        try:
+            st = os.stat(os.path.join(mods_dir, filename))
+        except OSError:
+            return False
+        if (st.st_size, st.st_mtime_ns) != stamp:
+            return False
+    return True
+
+def get_snapshot(mods_dir: str) -> DirSnapshot:
+    """Archives in mods_dir, rescanned only when the directory or an archive has changed"""
+    global _snapshot
+    st = os.stat(mods_dir)
+    dir_key = (mods_dir, st.st_ino, st.st_mtime_ns)
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.dir_key == dir_key and _unchanged(mods_dir, snapshot):
+        return snapshot
+    with _lock:
+        current = _snapshot
+        # Another thread may have rescanned while this one waited
+        if current is not None and current is not snapshot and current.dir_key == dir_key \
+                and _unchanged(mods_dir, current):
+            return current
+        files = {}
+        stamps = {}
+        with os.scandir(mods_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(ARCHIVE_EXTENSIONS) and entry.is_file():
+                    entry_st = entry.stat()
+                    files[entry.name] = (entry_st.st_size, entry_st.st_mtime)
+                    stamps[entry.name] = (entry_st.st_size, entry_st.st_mtime_ns)
+        _snapshot = DirSnapshot(dir_key, files, stamps)
+        return _snapshot
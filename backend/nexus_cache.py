@@ -0,0 +1,68 @@
+"""
+Stale-while-revalidate cache for Nexusmods passthrough lookups.
+
+Cached payloads are served immediately; anything older than FRESH_SECONDS is
+refreshed in the background after the response is sent. In offline mode
+(NEXUS_OFFLINE=1 or toggled at runtime) only cached data is served and no
+Nexusmods requests are made.
+"""
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional, Tuple
+from database import get_api_cache, set_api_cache
+
+FRESH_SECONDS = int(os.getenv("NEXUS_CACHE_FRESH_SECONDS", "600"))
+
+_offline = os.getenv("NEXUS_OFFLINE", "").lower() in ("1", "true", "yes")
+_refreshing: set = set()
+_lock = threading.Lock()
+
+class NotCached(Exception):
+    """Raised in offline mode when nothing is cached for a key"""
+
+def is_offline() -> bool:
+    return _offline
+
+def set_offline(offline: bool):
+    global _offline
+    _offline = offline
+
+def _store(key: str, fetch: Callable[[], object]) -> object:
+    payload = fetch()
+    set_api_cache(key, json.dumps(payload), int(time.time()))
+    return payload
+
+def refresh(key: str, fetch: Callable[[], object]):
+    """Background refresh; concurrent refreshes of one key collapse into one"""
+    with _lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    try:
+        _store(key, fetch)
+    except Exception as e:
+        print(f"[nexus-cache] Background refresh of {key} failed: {e}")
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+
+def lookup(key: str, fetch: Callable[[], object]) -> Tuple[object, str, Optional[int], bool]:
+    """
+    Return (payload, status, age_seconds, needs_refresh).
+    status is hit, stale, miss or offline. Misses call fetch() inline
+    (its exceptions propagate); in offline mode a miss raises NotCached.
+    """
+    cached = get_api_cache(key)
+    if cached:
+        age = int(time.time()) - cached['fetched_at']
+        payload = json.loads(cached['payload'])
+        if _offline:
+            return payload, 'offline', age, False
+        if age < FRESH_SECONDS:
+            return payload, 'hit', age, False
+        return payload, 'stale', age, True
+    if _offline:
+        raise NotCached(key)
+    return _store(key, fetch), 'miss', 0, False
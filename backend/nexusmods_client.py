@@ -2,47 +2,115 @@
 Nexusmods API client using pynxm
 """
 import os
+import threading
 from typing import List, Dict, Optional
-from dotenv import load_dotenv
-import pynxm
+from resilience import CircuitBreaker, UpstreamError, call_with_retries
 
-load_dotenv()
+# Per-attempt HTTP timeout and overall deadline per call (retries included), in seconds
+CALL_TIMEOUT = float(os.getenv("NEXUS_CALL_TIMEOUT", "10"))
+CALL_DEADLINE = float(os.getenv("NEXUS_CALL_DEADLINE", "20"))
+MAX_RETRIES = int(os.getenv("NEXUS_MAX_RETRIES", "3"))
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+BREAKER_THRESHOLD = int(os.getenv("NEXUS_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.getenv("NEXUS_BREAKER_COOLDOWN", "30"))
+
+def _retry_after(response) -> Optional[float]:
+    value = response.headers.get("Retry-After") if response is not None else None
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None  # HTTP-date form; fall back to backoff
 
 class NexusmodsClient:
     def __init__(self):
         api_key = os.getenv("NEXUSMODS_API_KEY")
         if not api_key:
             raise ValueError("NEXUSMODS_API_KEY not found in environment")
+        # pynxm pulls in requests and websocket-client; import on first use, not at startup
+        import pynxm
+        import requests
+        self._request_error = requests.RequestException
         self.client = pynxm.Nexus(api_key)
+        self.breaker = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN)
+        self._local = threading.local()
+        # From the X-RL-* headers of the most recent response; None until one is seen
+        self.hourly_remaining: Optional[int] = None
+        self.daily_remaining: Optional[int] = None
+
+        # pynxm hard-codes a 30s timeout and hides the response on errors;
+        # wrap its session so each attempt uses our timeout and we can see status codes
+        session_request = self.client.session.request
+
+        def request(method, url, **kwargs):
+            kwargs["timeout"] = (min(3.05, self._local.timeout), self._local.timeout)
+            response = session_request(method, url, **kwargs)
+            self._local.response = response
+            self._note_rate_limit(response)
+            return response
+
+        self.client.session.request = request
+
+    def _note_rate_limit(self, response):
+        try:
+            hourly = response.headers.get("X-RL-Hourly-Remaining")
+            daily = response.headers.get("X-RL-Daily-Remaining")
+            if hourly is not None:
+                self.hourly_remaining = int(hourly)
+            if daily is not None:
+                self.daily_remaining = int(daily)
+        except (AttributeError, ValueError):
+            pass
+
+    def _call(self, fn, *args):
+        """Run a pynxm call with deadline, retries and the circuit breaker"""
+        def attempt(timeout: float):
+            self._local.timeout = timeout
+            self._local.response = None
+            try:
+                return fn(*args)
+            except self._request_error as e:
+                raise UpstreamError(f"{type(e).__name__}: {e}") from e
+            except Exception as e:
+                response = self._local.response
+                if response is None or response.status_code in (200, 201):
+                    raise
+                raise UpstreamError(str(e), response.status_code, _retry_after(response)) from e
+
+        return call_with_retries(
+            attempt, self.breaker,
+            deadline=CALL_DEADLINE, attempt_timeout=CALL_TIMEOUT, max_retries=MAX_RETRIES,
+            backoff_base=BACKOFF_BASE, backoff_cap=BACKOFF_CAP,
+        )
 
     def get_mod_details(self, game: str, mod_id: int) -> Dict:
         """Get mod details from Nexusmods"""
-        return self.client.mod_details(game, mod_id)
+        return self._call(self.client.mod_details, game, mod_id)
 
     def get_mod_files(self, game: str, mod_id: int) -> List[Dict]:
         """Get all files for a mod"""
-        response = self.client.mod_file_list(game, mod_id)
+        response = self._call(self.client.mod_file_list, game, mod_id)
         return response.get('files', [])
 
     def get_file_details(self, game: str, mod_id: int, file_id: int) -> Dict:
         """Get specific file details"""
-        return self.client.mod_file_details(game, mod_id, file_id)
+        return self._call(self.client.mod_file_details, game, mod_id, file_id)
 
     def get_tracked_mods(self) -> List[Dict]:
         """Get user's tracked mods from Nexusmods"""
-        return self.client.user_tracked_list()
+        return self._call(self.client.user_tracked_list)
 
     def track_mod(self, game: str, mod_id: int):
         """Track a mod on Nexusmods"""
-        self.client.user_tracked_add(game, str(mod_id))
+        self._call(self.client.user_tracked_add, game, str(mod_id))
 
     def untrack_mod(self, game: str, mod_id: int):
         """Untrack a mod on Nexusmods"""
-        self.client.user_tracked_delete(game, str(mod_id))
+        self._call(self.client.user_tracked_delete, game, str(mod_id))
 
     def get_updated_mods(self, game: str, period: str) -> List[Dict]:
         """Get mods updated in a given period. Period: '1d', '1w', or '1m'."""
-        return self.client.game_updated_list(game, period)
+        return self._call(self.client.game_updated_list, game, period)
 
     def get_download_link(self, game: str, mod_id: int, file_id: int) -> str:
         """Generate download link (requires premium for direct download)"""
@@ -0,0 +1,131 @@
+"""
+In-process snapshot of the mods table.
+
+Hot paths (local file listing, scans, auto-detect, cleanup, check-all,
+refresh-all) only need a handful of columns and a lookup by local_file,
+(game, mod_id) or latest_file_name. The registry keeps one compact
+__slots__ record per row, patched by the write listener in database.py,
+and builds its secondary indexes lazily after each change. Index objects
+are never mutated once built, so readers can use them without locking.
+"""
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from database import add_write_listener, get_mod_rows
+
+class ModRecord:
+    """Read-only view of the mods columns used by scans and update checks"""
+    __slots__ = (
+        'id', 'local_file', 'mod_id', 'file_id', 'game', 'name', 'version',
+        'mod_name', 'category_name', 'size_in_bytes', 'latest_file_id',
+        'latest_version', 'latest_file_name', 'local_file_mtime',
+        'last_checked', 'update_available', 'updated_at',
+    )
+
+    def __init__(self, row):
+        for field, value in zip(self.__slots__, row):
+            object.__setattr__(self, field, value)
+        object.__setattr__(self, 'update_available', bool(self.update_available))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("ModRecord is read-only")
+
+    # Dict-style access so records can stand in for get_all_mods() rows
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+class _Indexes:
+    __slots__ = ('all', 'by_id', 'by_local_file', 'by_game_mod', 'by_game',
+                 'by_latest_file_name', 'update_available')
+
+    def __init__(self, records: Dict[int, ModRecord]):
+        # Same order as get_all_mods(): most recently updated first
+        self.all: List[ModRecord] = sorted(
+            records.values(), key=lambda r: r.updated_at or '', reverse=True
+        )
+        self.by_local_file: Dict[str, ModRecord] = {}
+        self.by_id: Dict[int, ModRecord] = dict(records)
+        self.by_game_mod: Dict[Tuple[str, int], List[ModRecord]] = {}
+        self.by_game: Dict[str, List[ModRecord]] = {}
+        self.by_latest_file_name: Dict[str, ModRecord] = {}
+        self.update_available: List[ModRecord] = []
+        for rec in self.all:
+            self.by_local_file[rec.local_file] = rec
+            self.by_game_mod.setdefault((rec.game, rec.mod_id), []).append(rec)
+            self.by_game.setdefault(rec.game, []).append(rec)
+            if rec.update_available:
+                self.update_available.append(rec)
+                if rec.latest_file_name:
+                    self.by_latest_file_name[rec.latest_file_name] = rec
+
+class ModRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: Optional[Dict[int, ModRecord]] = None
+        self._indexes: Optional[_Indexes] = None
+        # Bumped on every change; lets callers memoise values derived from the registry
+        self.generation = 0
+
+    def _load(self) -> Dict[int, ModRecord]:
+        return {row[0]: ModRecord(row) for row in get_mod_rows(list(ModRecord.__slots__))}
+
+    def _current(self) -> _Indexes:
+        indexes = self._indexes
+        if indexes is not None:
+            return indexes
+        with self._lock:
+            if self._records is None:
+                self._records = self._load()
+            if self._indexes is None:
+                self._indexes = _Indexes(self._records)
+            return self._indexes
+
+    def on_write(self, op: str, mod_db_ids: List[int]):
+        """database write listener: patch the affected records"""
+        with self._lock:
+            self.generation += 1
+            if self._records is None:
+                return  # not loaded yet; the first read will see the change
+            # Re-read under the lock so concurrent writes to one row apply in order
+            rows = [] if op == 'delete' else get_mod_rows(list(ModRecord.__slots__), mod_db_ids)
+            for mod_db_id in mod_db_ids:
+                self._records.pop(mod_db_id, None)
+            for row in rows:
+                self._records[row[0]] = ModRecord(row)
+            self._indexes = None
+
+    def all(self) -> List[ModRecord]:
+        return self._current().all
+
+    def get_by_id(self, mod_db_id: int) -> Optional[ModRecord]:
+        return self._current().by_id.get(mod_db_id)
+
+    def local_files(self) -> Dict[str, ModRecord]:
+        """local_file -> record (do not mutate)"""
+        return self._current().by_local_file
+
+    def game_mods(self) -> Set[Tuple[str, int]]:
+        """Distinct (game, mod_id) pairs"""
+        return set(self._current().by_game_mod)
+
+    def by_game(self) -> Dict[str, List[ModRecord]]:
+        """game -> records (do not mutate)"""
+        return self._current().by_game
+
+    def pending_by_latest_file_name(self) -> Dict[str, ModRecord]:
+        """latest_file_name -> record, for mods with an update available (do not mutate)"""
+        return self._current().by_latest_file_name
+
+    def update_available(self) -> List[ModRecord]:
+        return self._current().update_available
+
+mod_registry = ModRegistry()
+add_write_listener(mod_registry.on_write)
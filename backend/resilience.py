@@ -0,0 +1,134 @@
+"""
+Deadlines, retries and a circuit breaker for outbound Nexusmods calls.
+
+Each call gets an overall deadline. Attempts that fail with 429, 5xx,
+timeouts or connection errors are retried with capped exponential backoff
+and full jitter, honouring Retry-After. Consecutive failures open the
+breaker, and while it is open calls fail immediately instead of waiting on an
+API that is already down. After a cooldown one probe call is let through
+(half-open); success closes the breaker again.
+"""
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+class CircuitOpenError(Exception):
+    """Raised without calling Nexusmods while the breaker is open"""
+
+class UpstreamError(Exception):
+    """A failed Nexusmods call, with its HTTP status if one was received"""
+
+    def __init__(self, message: str, status: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        # No status means a timeout or connection error
+        return self.status is None or self.status == 429 or self.status >= 500
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        self._last_error: Optional[str] = None
+        self._last_failure_at: Optional[float] = None
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go out now"""
+        with self._lock:
+            if self._state == 'open':
+                if time.time() < self._open_until:
+                    raise CircuitOpenError(
+                        f"Nexusmods circuit open for {self._open_until - time.time():.0f}s "
+                        f"after {self._failures} failures: {self._last_error}"
+                    )
+                self._state = 'half_open'
+                self._probe_in_flight = False
+            if self._state == 'half_open':
+                if self._probe_in_flight:
+                    raise CircuitOpenError("Nexusmods circuit half-open: probe call in progress")
+                self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._state = 'closed'
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """Let another probe through after one ended without an outcome"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self, error: str, hold_for: Optional[float] = None):
+        """Count a failure; hold_for (e.g. Retry-After) opens the breaker for exactly that long"""
+        with self._lock:
+            self._failures += 1
+            self._last_error = error
+            self._last_failure_at = time.time()
+            self._probe_in_flight = False
+            if self._state == 'half_open' or self._failures >= self.failure_threshold or hold_for:
+                self._state = 'open'
+                self._opened_at = time.time()
+                self._open_until = self._opened_at + (hold_for if hold_for else self.cooldown)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = time.time()
+            return {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'failure_threshold': self.failure_threshold,
+                'retry_in_seconds': max(0.0, round(self._open_until - now, 1)) if self._state == 'open' else 0.0,
+                'last_error': self._last_error,
+                'last_failure_at': self._last_failure_at,
+            }
+
+def call_with_retries(fn: Callable[[float], object], breaker: CircuitBreaker, *,
+                      deadline: float, attempt_timeout: float, max_retries: int,
+                      backoff_base: float, backoff_cap: float):
+    """
+    Run fn(timeout) until it succeeds, a non-retryable error occurs, retries
+    run out or the deadline (seconds from now) would be exceeded.
+    fn should raise UpstreamError on failure; any other exception is counted
+    as a failure and re-raised without retrying.
+    """
+    stop_at = time.monotonic() + deadline
+    attempt = 0
+    while True:
+        breaker.before_call()
+        remaining = stop_at - time.monotonic()
+        try:
+            result = fn(max(0.1, min(attempt_timeout, remaining)))
+        except UpstreamError as e:
+            if not e.retryable:
+                # The API answered; it's healthy even if the request was bad
+                breaker.record_success()
+                raise
+            breaker.record_failure(str(e), hold_for=e.retry_after if e.status == 429 else None)
+            delay = e.retry_after if e.retry_after is not None else \
+                random.uniform(0, min(backoff_cap, backoff_base * 2 ** attempt))
+            attempt += 1
+            if attempt > max_retries or time.monotonic() + delay >= stop_at:
+                raise
+            time.sleep(delay)
+            continue
+        except Exception as e:
+            # Anything else (bad payload, client bug) still ends a half-open probe
+            breaker.record_failure(f"{type(e).__name__}: {e}")
+            raise
+        except BaseException:
+            breaker.release_probe()
+            raise
+        breaker.record_success()
+        return result
@@ -0,0 +1,81 @@
+"""
+Database admin router - Query profiling, backups, export/import
+"""
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from datetime import datetime
+import tempfile
+import db_profiler
+from backup import backup_database, list_backups, export_ndjson, export_csv_gz, import_file
+from jobs import register_job
+from models import ProfilerSettings
+
+router = APIRouter()
+
+@router.get("/profile")
+def get_query_profile(limit: int = Query(50, ge=1, le=500)):
+    """Per-statement call counts, timings, VM steps and plans of slow statements"""
+    return db_profiler.summary(limit)
+
+@router.put("/profile")
+def set_query_profiling(body: ProfilerSettings):
+    """Turn profiling on or off (resets to DB_PROFILE on restart)"""
+    db_profiler.configure(body.enabled, body.slow_query_ms)
+    return db_profiler.summary(0)
+
+@router.delete("/profile")
+def reset_query_profile():
+    """Clear collected statement stats"""
+    db_profiler.reset()
+    return db_profiler.summary(0)
+
+@router.post("/backup")
+def create_backup():
+    """
+    Online backup to BACKUP_DIR. Pages are copied in small steps so other
+    requests keep working; use the backup job to avoid waiting on it.
+    """
+    try:
+        return backup_database()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Backup failed: {e}")
+
+@register_job("backup")
+def backup_job(job):
+    # Writing progress to the jobs table would change the database mid-copy
+    # and restart the backup, so it stays in memory until the job finishes
+    return backup_database(progress=lambda done, total: job.progress(done, total, persist=False))
+
+@router.get("/backups")
+def get_backups():
+    """Backups in BACKUP_DIR, newest first"""
+    return list_backups()
+
+@router.get("/export")
+def export_mods(format: str = Query("ndjson", pattern="^(ndjson|csv\\.gz)$")):
+    """Stream the mods table as NDJSON or gzip-compressed CSV"""
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    if format == "ndjson":
+        body, media_type = export_ndjson(), "application/x-ndjson"
+    else:
+        body, media_type = export_csv_gz(), "application/gzip"
+    return StreamingResponse(body, media_type=media_type, headers={
+        "Content-Disposition": f'attachment; filename="mods-{stamp}.{format}"'
+    })
+
+@router.post("/import")
+async def import_mods(request: Request, format: str = Query("ndjson", pattern="^(ndjson|csv\\.gz|csv)$")):
+    """
+    Import an export (request body; gzip detected automatically). Rows whose
+    (mod_id, file_id) or local_file already exist are skipped.
+    """
+    # Spool to disk so the upload is never held in memory
+    with tempfile.TemporaryFile() as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        try:
+            return await run_in_threadpool(import_file, spool, "ndjson" if format == "ndjson" else "csv")
+        except (UnicodeDecodeError, OSError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"Could not read import: {e}")
@@ -0,0 +1,55 @@
+"""
+Jobs router - Run long operations in the background and poll their progress
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+import json
+from models import Job, JobSubmit
+from database import get_job, list_jobs
+from jobs import submit_job, cancel_job, job_types, live_progress
+
+router = APIRouter()
+
+def _decode(job: dict) -> dict:
+    """Parse the JSON columns of a job row"""
+    job = dict(job)
+    for key in ("params", "result"):
+        if job.get(key):
+            job[key] = json.loads(job[key])
+    return job
+
+@router.get("/", response_model=List[Job])
+def list_all_jobs(type: Optional[str] = None, limit: int = Query(50, ge=1, le=500)):
+    """List recent jobs (results omitted; fetch a single job for its result)"""
+    return [_decode(live_progress(job)) for job in list_jobs(type, limit)]
+
+@router.get("/types")
+def list_job_types():
+    """Job types that can be submitted"""
+    return job_types()
+
+@router.post("/{job_type}", response_model=Job, status_code=202)
+def submit(job_type: str, body: Optional[JobSubmit] = None):
+    """
+    Queue a job: refresh-all, check-all or cleanup.
+    Returns immediately; poll GET /api/jobs/{id} for progress and result.
+    """
+    if job_type not in job_types():
+        raise HTTPException(status_code=404, detail=f"Unknown job type: {job_type}")
+    return _decode(submit_job(job_type, body.params if body else None))
+
+@router.get("/{job_id}", response_model=Job)
+def get_job_status(job_id: str):
+    """Get a job's status, progress and (once finished) result"""
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _decode(live_progress(job))
+
+@router.post("/{job_id}/cancel", response_model=Job)
+def cancel(job_id: str):
+    """Cancel a queued or running job"""
+    job = cancel_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _decode(job)
@@ -1,13 +1,17 @@
 """
 Local files router - Scan and manage local mod files
 """
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
 import os
 from datetime import datetime, timezone
 from pathlib import Path
 from models import LocalFile
-from database import get_all_mods, update_mod
+from database import update_mod
+from duplicates import find_duplicates
+from registry import mod_registry
+from mods_dir import get_snapshot
+from file_queue import queue_removal, purge_trash, status as removal_status
 from nexusmods_client import get_nexusmods_client
 
 router = APIRouter()
@@ -25,20 +29,16 @@ def get_mods_directory() -> str:
 def list_local_files():
     """List all local mod files in the mods directory"""
     mods_dir = get_mods_directory()
-    tracked_files = {mod['local_file'] for mod in get_all_mods()}
+    tracked_files = mod_registry.local_files()
 
     local_files = []
-    for filename in os.listdir(mods_dir):
-        if filename.endswith(('.zip', '.rar', '.7z')):
-            file_path = os.path.join(mods_dir, filename)
-            size_bytes = os.path.getsize(file_path)
-
-            local_files.append({
-                'filename': filename,
-                'size_bytes': size_bytes,
-                'path': file_path,
-                'mapped': filename in tracked_files
-            })
+    for filename, (size_bytes, _) in get_snapshot(mods_dir).files.items():
+        local_files.append({
+            'filename': filename,
+            'size_bytes': size_bytes,
+            'path': os.path.join(mods_dir, filename),
+            'mapped': filename in tracked_files
+        })
 
     return sorted(local_files, key=lambda x: x['filename'])
 
@@ -46,10 +46,9 @@ def list_local_files():
 def scan_mods_directory():
     """Scan mods directory and return statistics"""
     mods_dir = get_mods_directory()
-    tracked_mods = get_all_mods()
-    tracked_files = {mod['local_file'] for mod in tracked_mods}
+    tracked_files = mod_registry.local_files()
 
-    all_files = [f for f in os.listdir(mods_dir) if f.endswith(('.zip', '.rar', '.7z'))]
+    all_files = list(get_snapshot(mods_dir).files)
     unmapped_files = [f for f in all_files if f not in tracked_files]
 
     return {
@@ -61,17 +60,35 @@ def scan_mods_directory():
     }
 
 
+@router.get("/duplicates")
+def list_duplicate_files():
+    """
+    Report groups of byte-identical archives in the mods directory,
+    which copies are tracked, and how many bytes deleting the extras would free
+    """
+    mods_dir = get_mods_directory()
+    tracked = {local_file: mod.id for local_file, mod in mod_registry.local_files().items()}
+    return find_duplicates(mods_dir, tracked)
+
+
+@router.get("/removals")
+def get_removal_queue():
+    """Pending background removals and trash usage"""
+    return removal_status()
+
+@router.post("/trash/purge")
+def purge_trashed_files(max_age_hours: Optional[float] = Query(None, ge=0)):
+    """Permanently delete trashed files (older than max_age_hours; default the retention period)"""
+    return {"purged": purge_trash(max_age_hours)}
+
 @router.delete("/{filename:path}")
 def delete_local_file(filename: str):
-    """Delete a local file from the mods directory"""
+    """Delete a local file from the mods directory (removed in the background)"""
     mods_dir = get_mods_directory()
     file_path = os.path.join(mods_dir, filename)
-    if not os.path.exists(file_path):
+    if not os.path.isfile(file_path) or os.path.dirname(filename):
         raise HTTPException(status_code=404, detail="File not found")
-    try:
-        os.remove(file_path)
-    except OSError as e:
-        raise HTTPException(status_code=500, detail=f"Failed to delete file: {e}")
+    queue_removal(filename, "delete-local")
     return {"message": f"Deleted {filename}"}
 
 @router.post("/auto-detect")
@@ -81,11 +98,10 @@ def auto_detect_updates():
     latest_file_name. For each match:
       1. Update tracking (promote latest_file_id -> file_id, re-fetch metadata)
       2. Update local_file to the new filename
-      3. Delete the old file from disk
+      3. Queue the old file for removal
     Returns a list of mods that were auto-updated.
     """
     mods_dir = get_mods_directory()
-    tracked_mods = get_all_mods()
 
     # Files currently on disk
     disk_files = set(
@@ -93,12 +109,8 @@ def auto_detect_updates():
         if f.endswith(('.zip', '.rar', '.7z'))
     )
 
-    # Build lookup: latest_file_name -> mod (only mods with pending updates)
-    pending = {}
-    for mod in tracked_mods:
-        lfn = mod.get("latest_file_name")
-        if lfn and mod.get("update_available"):
-            pending[lfn] = mod
+    # Lookup: latest_file_name -> mod (only mods with pending updates)
+    pending = mod_registry.pending_by_latest_file_name()
 
     results = []
     client = get_nexusmods_client()
@@ -160,15 +172,9 @@ def auto_detect_updates():
         }
         updated_mod = update_mod(mod["id"], updates)
 
-        # Delete old file if it's different and still exists
+        # Remove the old file in the background
         if old_local_file != filename:
-            old_path = os.path.join(mods_dir, old_local_file)
-            if os.path.exists(old_path):
-                try:
-                    os.remove(old_path)
-                    print(f"[auto-detect] Deleted old file: {old_local_file}")
-                except OSError as e:
-                    print(f"[auto-detect] Failed to delete {old_local_file}: {e}")
+            queue_removal(old_local_file, "auto-detect")
 
         print(f"[auto-detect] Updated mod {mod['id']}: {old_local_file} -> {filename}")
         results.append({
@@ -1,20 +1,31 @@
 """
 Mods router - CRUD operations for tracked mods
 """
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from models import Mod, ModCreate, ModUpdate
-from database import get_all_mods, get_mod_by_id, create_mod, update_mod, delete_mod
+from models import (
+    Mod, ModCreate, ModUpdate, ModSearchResult, ModBatchCreate, ModBatchResponse,
+    ModBulkRequest, ModBulkResponse,
+)
+from database import (
+    get_all_mods, get_mod_by_id, create_mod, create_mods, update_mod, delete_mod,
+    search_mods, get_changes, delete_mods, update_mods,
+)
 from nexusmods_client import get_nexusmods_client
+from file_queue import queue_removal
+from jobs import register_job
+from registry import mod_registry
 
 router = APIRouter()
 
-@router.get("/")
-def list_mods():
-    """List all tracked mods"""
-    mods = get_all_mods()
+# Concurrent Nexusmods requests per batch; keeps bursts well inside the hourly quota
+BATCH_FETCH_WORKERS = 4
+
+def _with_file_exists(mods: List[dict]) -> List[dict]:
+    """Annotate mod rows with whether their local file is on disk"""
     mods_dir = os.getenv("MODS_DIR", "")
     for mod in mods:
         if mods_dir and mod.get("local_file"):
@@ -23,6 +34,61 @@ def list_mods():
             mod["file_exists"] = None
     return mods
 
+@router.get("/")
+def list_mods():
+    """List all tracked mods"""
+    return _with_file_exists(get_all_mods())
+
+@router.get("/changes")
+def list_mod_changes(
+    since: Optional[int] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+):
+    """
+    Delta sync: mods inserted/updated/deleted after cursor `since`.
+    Call without `since` (or after `reset: true`) to get the current cursor,
+    then fetch the full list once and poll with the returned cursor.
+    """
+    changes = get_changes(since, limit)
+    _with_file_exists(changes["upserts"])
+    return changes
+
+@router.get("/search", response_model=List[ModSearchResult])
+def search_tracked_mods(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Full-text prefix search over mod name, author, file names, description and local file"""
+    return search_mods(q, limit)
+
+def _build_mod_data(mod_create: ModCreate, mod_details: dict, file_details: dict,
+                    local_file_mtime: Optional[str]) -> dict:
+    """Assemble a mods row from the request and fetched Nexusmods metadata"""
+    return {
+        'local_file': mod_create.local_file,
+        'mod_id': mod_create.mod_id,
+        'file_id': mod_create.file_id,
+        'game': mod_create.game,
+        'name': file_details.get('name'),
+        'file_name': file_details.get('file_name'),
+        'description': file_details.get('description'),
+        'size_in_bytes': file_details.get('size_in_bytes'),
+        'version': file_details.get('version'),
+        'mod_name': mod_details.get('name'),
+        'author': mod_details.get('author'),
+        'category_name': file_details.get('category_name'),
+        'uploaded_time': file_details.get('uploaded_time'),
+        'local_file_mtime': local_file_mtime,
+    }
+
+def _create_error_detail(error: str) -> str:
+    """Map an insert failure to a user-facing message"""
+    if 'UNIQUE constraint' in error:
+        if 'mod_id' in error or 'uq_mod_file' in error:
+            return "This mod file (mod_id + file_id) is already registered"
+        return "A mod with this local file already exists"
+    return error
+
 @router.post("/", response_model=Mod)
 def add_mod(mod_create: ModCreate):
     """Add a new mod to track"""
@@ -44,38 +110,148 @@ def add_mod(mod_create: ModCreate):
                 os.path.getmtime(file_path), tz=timezone.utc
             ).isoformat()
 
-    mod_data = {
-        'local_file': mod_create.local_file,
-        'mod_id': mod_create.mod_id,
-        'file_id': mod_create.file_id,
-        'game': mod_create.game,
-        'name': file_details.get('name'),
-        'file_name': file_details.get('file_name'),
-        'description': file_details.get('description'),
-        'size_in_bytes': file_details.get('size_in_bytes'),
-        'version': file_details.get('version'),
-        'mod_name': mod_details.get('name'),
-        'author': mod_details.get('author'),
-        'category_name': file_details.get('category_name'),
-        'uploaded_time': file_details.get('uploaded_time'),
-        'local_file_mtime': local_file_mtime,
-    }
+    mod_data = _build_mod_data(mod_create, mod_details, file_details, local_file_mtime)
 
     try:
         return create_mod(mod_data)
     except Exception as e:
-        if 'UNIQUE constraint' in str(e):
-            if 'mod_id' in str(e) or 'uq_mod_file' in str(e):
-                raise HTTPException(status_code=400, detail="This mod file (mod_id + file_id) is already registered")
-            raise HTTPException(status_code=400, detail="A mod with this local file already exists")
-        raise HTTPException(status_code=400, detail=str(e))
+        raise HTTPException(status_code=400, detail=_create_error_detail(str(e)))
+
+@router.post("/batch", response_model=ModBatchResponse)
+def add_mods_batch(batch: ModBatchCreate):
+    """
+    Map many local files at once.
+    Mod details are fetched once per (game, mod_id), file details concurrently,
+    local mtimes come from a single directory pass, and all rows are inserted
+    in one transaction. Returns a per-item result in request order.
+    """
+    client = get_nexusmods_client()
+    items = batch.items
+
+    mod_keys = list(dict.fromkeys((item.game, item.mod_id) for item in items))
+    file_keys = list(dict.fromkeys((item.game, item.mod_id, item.file_id) for item in items))
+
+    def fetch(fn, key):
+        try:
+            return key, fn(*key), None
+        except Exception as e:
+            return key, None, str(e)
+
+    with ThreadPoolExecutor(max_workers=BATCH_FETCH_WORKERS) as pool:
+        mod_results = pool.map(lambda k: fetch(client.get_mod_details, k), mod_keys)
+        file_results = pool.map(lambda k: fetch(client.get_file_details, k), file_keys)
+        mod_details = {key: (data, err) for key, data, err in mod_results}
+        file_details = {key: (data, err) for key, data, err in file_results}
+
+    # One directory pass instead of a stat per item
+    mtimes = {}
+    mods_dir = os.getenv("MODS_DIR", "")
+    if mods_dir and os.path.isdir(mods_dir):
+        with os.scandir(mods_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    mtimes[entry.name] = datetime.fromtimestamp(
+                        entry.stat().st_mtime, tz=timezone.utc
+                    ).isoformat()
+
+    results = [None] * len(items)
+    to_insert = []
+    for index, item in enumerate(items):
+        mod_data, mod_err = mod_details[(item.game, item.mod_id)]
+        file_data, file_err = file_details[(item.game, item.mod_id, item.file_id)]
+        if mod_err or file_err:
+            results[index] = {
+                'index': index, 'local_file': item.local_file, 'success': False,
+                'error': f"Failed to fetch mod details: {mod_err or file_err}",
+            }
+            continue
+        to_insert.append((index, _build_mod_data(item, mod_data, file_data, mtimes.get(item.local_file))))
+
+    for (index, _), outcome in zip(to_insert, create_mods([data for _, data in to_insert])):
+        item = items[index]
+        if 'mod' in outcome:
+            results[index] = {'index': index, 'local_file': item.local_file, 'success': True, 'mod': outcome['mod']}
+        else:
+            results[index] = {
+                'index': index, 'local_file': item.local_file, 'success': False,
+                'error': _create_error_detail(outcome['error']),
+            }
+
+    created = sum(1 for r in results if r['success'])
+    return {'created': created, 'failed': len(results) - created, 'results': results}
+
+@router.post("/bulk/delete", response_model=ModBulkResponse)
+def bulk_delete_mods(body: ModBulkRequest):
+    """Delete many mods in one transaction; their local files are removed in the background"""
+    deleted = delete_mods(list(dict.fromkeys(body.ids)))
+    for row in deleted:
+        if row.get("local_file"):
+            queue_removal(row["local_file"], "bulk delete")
+    ids = {row["id"] for row in deleted}
+    return {
+        "succeeded": sorted(ids),
+        "missing": [i for i in dict.fromkeys(body.ids) if i not in ids],
+        "files_queued": sum(1 for row in deleted if row.get("local_file")),
+    }
+
+@router.post("/bulk/untrack", response_model=ModBulkResponse)
+def bulk_untrack_mods(body: ModBulkRequest):
+    """Stop tracking many mods in one transaction, leaving their files in place"""
+    deleted = delete_mods(list(dict.fromkeys(body.ids)))
+    ids = {row["id"] for row in deleted}
+    return {
+        "succeeded": sorted(ids),
+        "missing": [i for i in dict.fromkeys(body.ids) if i not in ids],
+    }
+
+@router.post("/bulk/mark-updated", response_model=ModBulkResponse)
+def bulk_mark_mods_updated(body: ModBulkRequest):
+    """
+    Mark many mods as updated. File details are fetched concurrently, all
+    rows are updated in one transaction, and replaced files are removed in
+    the background. Mods without a pending update are reported as failed.
+    """
+    mods = {mod.id: mod for mod in (mod_registry.get_by_id(i) for i in dict.fromkeys(body.ids)) if mod}
+    missing = [i for i in dict.fromkeys(body.ids) if i not in mods]
+    failed = [
+        {"id": i, "error": "No pending update to mark"}
+        for i, mod in mods.items() if not (mod["update_available"] and mod["latest_file_id"])
+    ]
+    pending = [mod for mod in mods.values() if mod["update_available"] and mod["latest_file_id"]]
 
-@router.post("/refresh-all", response_model=List[Mod])
-def refresh_all_metadata():
-    """Re-fetch metadata for all tracked mods."""
+    client = get_nexusmods_client()
+
+    def fetch(mod):
+        try:
+            return mod, client.get_file_details(mod["game"], mod["mod_id"], mod["latest_file_id"]), None
+        except Exception as e:
+            return mod, None, str(e)
+
+    mods_dir = os.getenv("MODS_DIR", "")
+    changes = {}
+    with ThreadPoolExecutor(max_workers=BATCH_FETCH_WORKERS) as pool:
+        for mod, file_details, error in pool.map(fetch, pending):
+            if error:
+                failed.append({"id": mod["id"], "error": f"Failed to fetch file details: {error}"})
+            else:
+                changes[mod["id"]] = _promotion(mod.to_dict(), file_details, mods_dir)
+
+    outcome = update_mods(changes)
+    updated = outcome["updated"]
+    failed.extend({"id": i, "error": _create_error_detail(e)} for i, e in outcome["errors"].items())
+    queued = 0
+    for mod_db_id in updated:
+        old_file = mods[mod_db_id]["local_file"]
+        if old_file != changes[mod_db_id]["local_file"]:
+            queue_removal(old_file, "bulk mark-updated")
+            queued += 1
+    return {"succeeded": updated, "missing": missing, "failed": failed, "files_queued": queued}
+
+def _refresh_all(track=iter) -> List[dict]:
+    """Re-fetch metadata for every tracked mod, iterating through `track`"""
     client = get_nexusmods_client()
     results = []
-    for mod in get_all_mods():
+    for mod in track(mod_registry.all()):
         try:
             mod_details = client.get_mod_details(mod["game"], mod["mod_id"])
             file_details = client.get_file_details(mod["game"], mod["mod_id"], mod["file_id"])
@@ -93,26 +269,42 @@ def refresh_all_metadata():
             results.append(update_mod(mod["id"], updates))
         except Exception as e:
             print(f"Failed to refresh mod {mod['id']}: {e}")
-            results.append(mod)
+            results.append(get_mod_by_id(mod["id"]))
     return results
 
-@router.post("/cleanup")
-def cleanup_orphans():
-    """Remove tracked mods whose local file no longer exists on disk"""
+@router.post("/refresh-all", response_model=List[Mod])
+def refresh_all_metadata():
+    """Re-fetch metadata for all tracked mods."""
+    return _refresh_all()
+
+@register_job("refresh-all")
+def refresh_all_job(job):
+    return _refresh_all(job.track)
+
+def _cleanup_orphans(track=iter) -> dict:
+    """Delete rows whose local file is gone, iterating through `track`"""
     mods_dir = os.getenv("MODS_DIR", "")
     if not mods_dir:
         raise HTTPException(status_code=500, detail="MODS_DIR not configured")
 
-    mods = get_all_mods()
     removed = []
-    for mod in mods:
+    for mod in track(mod_registry.all()):
         local_file = mod.get("local_file")
         if local_file and not os.path.exists(os.path.join(mods_dir, local_file)):
-            delete_mod(mod["id"])
             removed.append({"id": mod["id"], "local_file": local_file, "mod_name": mod.get("mod_name")})
+    delete_mods([r["id"] for r in removed])
 
     return {"removed": len(removed), "details": removed}
 
+@router.post("/cleanup")
+def cleanup_orphans():
+    """Remove tracked mods whose local file no longer exists on disk"""
+    return _cleanup_orphans()
+
+@register_job("cleanup")
+def cleanup_job(job):
+    return _cleanup_orphans(job.track)
+
 @router.get("/{mod_db_id}", response_model=Mod)
 def get_mod(mod_db_id: int):
     """Get a specific mod by database ID"""
@@ -163,31 +355,9 @@ def refresh_mod_metadata(mod_db_id: int):
     return update_mod(mod_db_id, updates)
 
 
-@router.post("/{mod_db_id}/mark-updated", response_model=Mod)
-def mark_mod_updated(mod_db_id: int):
-    """
-    Mark a mod as updated after manual download.
-    Promotes latest_file_id to file_id, re-fetches file metadata, and clears update flag.
-    """
-    mod = get_mod_by_id(mod_db_id)
-    if not mod:
-        raise HTTPException(status_code=404, detail="Mod not found")
-
-    latest_file_id = mod.get("latest_file_id")
-    if not latest_file_id or not mod.get("update_available"):
-        raise HTTPException(status_code=400, detail="No pending update to mark")
-
-    # Fetch updated file metadata from Nexusmods
-    client = get_nexusmods_client()
-    try:
-        file_details = client.get_file_details(mod["game"], mod["mod_id"], latest_file_id)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch file details: {e}")
-
-    # Update local_file to the new filename and record its mtime
+def _promotion(mod: dict, file_details: dict, mods_dir: str) -> dict:
+    """Column updates that make a mod's pending latest file its current file"""
     new_local_file = mod.get("latest_file_name") or mod["local_file"]
-    old_local_file = mod["local_file"]
-    mods_dir = os.getenv("MODS_DIR", "")
 
     local_file_mtime = None
     if mods_dir:
@@ -197,8 +367,8 @@ def mark_mod_updated(mod_db_id: int):
                 os.path.getmtime(new_file_path), tz=timezone.utc
             ).isoformat()
 
-    updates = {
-        "file_id": latest_file_id,
+    return {
+        "file_id": mod["latest_file_id"],
         "local_file": new_local_file,
         "local_file_mtime": local_file_mtime,
         "version": file_details.get("version"),
@@ -214,20 +384,36 @@ def mark_mod_updated(mod_db_id: int):
         "latest_file_name": None,
     }
 
+@router.post("/{mod_db_id}/mark-updated", response_model=Mod)
+def mark_mod_updated(mod_db_id: int):
+    """
+    Mark a mod as updated after manual download.
+    Promotes latest_file_id to file_id, re-fetches file metadata, and clears update flag.
+    The old file is removed in the background.
+    """
+    mod = get_mod_by_id(mod_db_id)
+    if not mod:
+        raise HTTPException(status_code=404, detail="Mod not found")
+
+    latest_file_id = mod.get("latest_file_id")
+    if not latest_file_id or not mod.get("update_available"):
+        raise HTTPException(status_code=400, detail="No pending update to mark")
+
+    # Fetch updated file metadata from Nexusmods
+    client = get_nexusmods_client()
+    try:
+        file_details = client.get_file_details(mod["game"], mod["mod_id"], latest_file_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch file details: {e}")
+
+    updates = _promotion(mod, file_details, os.getenv("MODS_DIR", ""))
     result = update_mod(mod_db_id, updates)
 
-    # Delete old file if it's different and still exists
-    if old_local_file != new_local_file and mods_dir:
-        old_path = os.path.join(mods_dir, old_local_file)
-        if os.path.exists(old_path):
-            try:
-                os.remove(old_path)
-            except OSError as e:
-                print(f"[mark-updated] Failed to delete {old_local_file}: {e}")
+    if mod["local_file"] != updates["local_file"]:
+        queue_removal(mod["local_file"], "mark-updated")
 
     return result
 
-
 @router.delete("/{mod_db_id}")
 def remove_mod(mod_db_id: int):
     """Remove a tracked mod and its local file"""
@@ -235,15 +421,8 @@ def remove_mod(mod_db_id: int):
     if not mod:
         raise HTTPException(status_code=404, detail="Mod not found")
 
-    # Delete local file from disk
-    mods_dir = os.getenv("MODS_DIR", "")
-    if mods_dir and mod.get("local_file"):
-        file_path = os.path.join(mods_dir, mod["local_file"])
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except OSError as e:
-                print(f"[delete] Failed to delete {mod['local_file']}: {e}")
-
     delete_mod(mod_db_id)
+    # The local file is removed in the background
+    if mod.get("local_file"):
+        queue_removal(mod["local_file"], "delete")
     return {"message": "Mod deleted successfully"}
@@ -1,57 +1,194 @@
 """
 Nexusmods API router - Direct access to Nexusmods API
 """
-from fastapi import APIRouter, HTTPException
-from typing import List
-from models import NexusmodsMod, NexusmodsFile
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Response
+from typing import List, Optional
+from models import NexusmodsMod, NexusmodsFile, OfflineMode
+import nexus_cache
 from nexusmods_client import get_nexusmods_client
+from resilience import CircuitOpenError, UpstreamError
+from catalog import sync_catalog, covers, changed_since
+from database import get_catalog_sync, get_catalog_entries, get_tracked, get_tracked_pulled_at
+from tracking import pull_tracked, pending_changes, sync_tracked
+from jobs import register_job
+import time
 
 router = APIRouter()
 
 @router.get("/tracked", response_model=List[dict])
-def get_tracked_from_nexusmods():
-    """Get mods tracked on Nexusmods (from user account)"""
-    client = get_nexusmods_client()
+def get_tracked_from_nexusmods(response: Response):
+    """
+    Mods tracked on the Nexusmods account, from the local copy (downloaded
+    on first use; refreshed by POST /tracked/sync). Age header gives its age.
+    """
+    if get_tracked_pulled_at() is None:
+        try:
+            pull_tracked(get_nexusmods_client(), force=True)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    response.headers["Age"] = str(max(0, int(time.time()) - get_tracked_pulled_at()))
+    return [
+        {"mod_id": e["mod_id"], "domain_name": e["game"], "managed": bool(e["managed"])}
+        for e in get_tracked()
+    ]
+
+@router.get("/tracked/pending")
+def get_tracked_pending():
+    """Track/untrack calls the next sync would make"""
+    changes = pending_changes()
+    return {
+        op: [{"game": game, "mod_id": mod_id} for game, mod_id in keys]
+        for op, keys in changes.items()
+    }
+
+@router.post("/tracked/sync")
+def sync_tracked_mods(pull: bool = False, batch: Optional[int] = Query(None, ge=0, le=500)):
+    """
+    Reconcile the tracked list with local mods: re-download it if stale (or
+    pull=true), then push at most `batch` track/untrack calls
+    """
     try:
-        return client.get_tracked_mods()
+        client = get_nexusmods_client()
+        return sync_tracked(client, force_pull=pull, batch=batch)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=502, detail=f"Tracked list sync failed: {e}")
 
-@router.get("/mods/{game}/{mod_id}", response_model=NexusmodsMod)
-def get_mod_from_nexusmods(game: str, mod_id: int):
-    """Get mod details from Nexusmods"""
-    client = get_nexusmods_client()
+@register_job("sync-tracked")
+def sync_tracked_job(job):
+    return sync_tracked(
+        get_nexusmods_client(), force_pull=bool(job.params.get("pull")),
+        batch=job.params.get("batch"), track=job.track,
+    )
+
+def _cached(key: str, fetch, response: Response, background_tasks: BackgroundTasks, not_found: str):
+    """
+    Serve from the stale-while-revalidate cache, setting cache headers.
+    A failed miss is 404 only when Nexusmods said so; 503 while the breaker
+    is open or offline, otherwise 502.
+    """
     try:
-        mod_data = client.get_mod_details(game, mod_id)
-        return {
-            'mod_id': mod_data['mod_id'],
-            'name': mod_data['name'],
-            'summary': mod_data.get('summary'),
-            'author': mod_data['author'],
-            'version': mod_data['version'],
-            'game': game,
-            'updated_time': mod_data['updated_time']
-        }
+        payload, status, age, needs_refresh = nexus_cache.lookup(key, fetch)
+    except nexus_cache.NotCached:
+        raise HTTPException(status_code=503, detail=f"{not_found}: not cached and offline mode is on")
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=f"Nexusmods unavailable: {e}")
     except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Mod not found: {str(e)}")
+        if isinstance(e, UpstreamError) and e.status == 404:
+            raise HTTPException(status_code=404, detail=f"{not_found}: {e}")
+        raise HTTPException(status_code=502, detail=f"Nexusmods request failed: {e}")
+    if needs_refresh:
+        background_tasks.add_task(nexus_cache.refresh, key, fetch)
+    response.headers["X-Cache"] = status
+    response.headers["Age"] = str(age)
+    return payload
+
+@router.get("/mods/{game}/{mod_id}", response_model=NexusmodsMod)
+def get_mod_from_nexusmods(game: str, mod_id: int, response: Response, background_tasks: BackgroundTasks):
+    """Get mod details from Nexusmods (cached; see X-Cache and Age headers)"""
+    mod_data = _cached(
+        f"mod:{game}:{mod_id}",
+        lambda: get_nexusmods_client().get_mod_details(game, mod_id),
+        response, background_tasks, "Mod not found",
+    )
+    return {
+        'mod_id': mod_data['mod_id'],
+        'name': mod_data['name'],
+        'summary': mod_data.get('summary'),
+        'author': mod_data['author'],
+        'version': mod_data['version'],
+        'game': game,
+        'updated_time': mod_data['updated_time']
+    }
 
 @router.get("/files/{game}/{mod_id}", response_model=List[NexusmodsFile])
-def get_files_from_nexusmods(game: str, mod_id: int):
-    """Get all files for a mod from Nexusmods"""
-    client = get_nexusmods_client()
+def get_files_from_nexusmods(game: str, mod_id: int, response: Response, background_tasks: BackgroundTasks):
+    """Get all files for a mod from Nexusmods (cached; see X-Cache and Age headers)"""
+    files = _cached(
+        f"files:{game}:{mod_id}",
+        lambda: get_nexusmods_client().get_mod_files(game, mod_id),
+        response, background_tasks, "Files not found",
+    )
+    return [
+        {
+            'file_id': f['file_id'],
+            'name': f['name'],
+            'version': f['version'],
+            'category_name': f.get('category_name', 'UNKNOWN'),
+            'size_kb': f.get('size_kb', 0),
+            'uploaded_time': f['uploaded_time'],
+            'file_name': f['file_name']
+        }
+        for f in files
+    ]
+
+@router.get("/status")
+def get_api_status():
+    """Circuit breaker state for outbound Nexusmods calls, plus offline mode"""
+    try:
+        client = get_nexusmods_client()
+        status = client.breaker.snapshot()
+        status["hourly_remaining"] = client.hourly_remaining
+        status["daily_remaining"] = client.daily_remaining
+    except ValueError as e:
+        status = {
+            "state": "unconfigured", "consecutive_failures": 0, "failure_threshold": 0,
+            "retry_in_seconds": 0.0, "last_error": str(e), "last_failure_at": None,
+            "hourly_remaining": None, "daily_remaining": None,
+        }
+    status["offline"] = nexus_cache.is_offline()
+    return status
+
+@router.get("/offline")
+def get_offline_mode():
+    """Whether the passthrough endpoints are serving cached data only"""
+    return {"offline": nexus_cache.is_offline()}
+
+@router.put("/offline")
+def set_offline_mode(body: OfflineMode):
+    """Turn offline mode on or off (resets to NEXUS_OFFLINE on restart)"""
+    nexus_cache.set_offline(body.offline)
+    return {"offline": nexus_cache.is_offline()}
+
+@router.post("/updated/{game}/sync")
+def sync_updated_catalog(game: str):
+    """Merge the latest updated-mods feed for a game into the local mirror"""
     try:
-        files = client.get_mod_files(game, mod_id)
-        return [
-            {
-                'file_id': f['file_id'],
-                'name': f['name'],
-                'version': f['version'],
-                'category_name': f.get('category_name', 'UNKNOWN'),
-                'size_kb': f.get('size_kb', 0),
-                'uploaded_time': f['uploaded_time'],
-                'file_name': f['file_name']
-            }
-            for f in files
-        ]
+        return sync_catalog(get_nexusmods_client(), game, force=True)
     except Exception as e:
-        raise HTTPException(status_code=404, detail=f"Files not found: {str(e)}")
+        raise HTTPException(status_code=502, detail=f"Failed to fetch updated mods: {e}")
+
+@router.get("/updated/{game}")
+def get_updated_from_mirror(
+    game: str,
+    since: int = Query(..., description="Unix timestamp"),
+    mod_ids: Optional[str] = Query(None, description="Comma-separated mod IDs"),
+):
+    """
+    Mods whose files changed after `since`, answered from the local mirror
+    (no API call). `complete` is false if the mirror doesn't reach back to `since`.
+    """
+    ids = [int(i) for i in mod_ids.split(",") if i.strip()] if mod_ids else None
+    sync = get_catalog_sync(game)
+    return {
+        "game": game,
+        "since": since,
+        "complete": covers(sync, since),
+        "covered_since": sync["covered_since"] if sync else None,
+        "synced_at": sync["synced_at"] if sync else None,
+        "mods": list(changed_since(game, since, ids).values()),
+    }
+
+@router.get("/updated/{game}/{mod_id}")
+def get_mod_freshness(game: str, mod_id: int):
+    """Last known file update/activity for any mod (tracked or not) from the local mirror"""
+    sync = get_catalog_sync(game)
+    entry = get_catalog_entries(game, [mod_id]).get(mod_id)
+    return {
+        "game": game,
+        "mod_id": mod_id,
+        "latest_file_update": entry["latest_file_update"] if entry else None,
+        "latest_mod_activity": entry["latest_mod_activity"] if entry else None,
+        # Absent from a covering mirror means unchanged since covered_since
+        "covered_since": sync["covered_since"] if sync else None,
+        "synced_at": sync["synced_at"] if sync else None,
+    }
@@ -0,0 +1,75 @@
+"""
+Stats router - Dashboard aggregates in one small response
+"""
+from fastapi import APIRouter
+import heapq
+import os
+import threading
+from registry import mod_registry
+from mods_dir import get_snapshot
+
+router = APIRouter()
+
+# Fields the dashboard lists need for each mod
+_SUMMARY_FIELDS = (
+    'id', 'local_file', 'mod_id', 'file_id', 'game', 'name', 'mod_name', 'version',
+    'latest_file_id', 'latest_version', 'last_checked', 'update_available',
+)
+RECENTLY_CHECKED = 5
+
+_cache = {'key': None, 'value': None}
+_lock = threading.Lock()
+
+def _summary(mod) -> dict:
+    return {field: mod[field] for field in _SUMMARY_FIELDS}
+
+def _compute(snapshot) -> dict:
+    mods = mod_registry.all()
+    tracked = mod_registry.local_files()
+
+    per_game = []
+    for game, game_mods in sorted(mod_registry.by_game().items()):
+        per_game.append({
+            'game': game,
+            'mods': len(game_mods),
+            'updates_available': sum(1 for m in game_mods if m.update_available),
+            'total_bytes': sum(m.size_in_bytes or 0 for m in game_mods),
+        })
+
+    result = {
+        'total_mods': len(mods),
+        'updates_available': len(mod_registry.update_available()),
+        'total_bytes': sum(g['total_bytes'] for g in per_game),
+        'per_game': per_game,
+        'updates': [_summary(m) for m in mod_registry.update_available()],
+        'recently_checked': [
+            _summary(m) for m in heapq.nlargest(
+                RECENTLY_CHECKED, (m for m in mods if m.last_checked), key=lambda m: m.last_checked
+            )
+        ],
+        'missing_files': None,
+        'local_files': None,
+    }
+    if snapshot is not None:
+        result['missing_files'] = sum(1 for f in tracked if f not in snapshot.files)
+        result['local_files'] = {
+            'total': len(snapshot.files),
+            'unmapped': sum(1 for f in snapshot.files if f not in tracked),
+            'total_bytes': snapshot.total_bytes,
+        }
+    return result
+
+@router.get("/")
+def get_stats():
+    """
+    Dashboard numbers: totals, per-game counts, pending updates and local
+    file stats. Recomputed only when the mods table or MODS_DIR has changed.
+    """
+    mods_dir = os.getenv("MODS_DIR", "")
+    snapshot = get_snapshot(mods_dir) if mods_dir and os.path.isdir(mods_dir) else None
+    key = (mod_registry.generation, snapshot.key if snapshot else None)
+    with _lock:
+        if _cache['key'] != key:
+            _cache['value'] = _compute(snapshot)
+            _cache['key'] = key
+        return _cache['value']
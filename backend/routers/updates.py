@@ -1,12 +1,18 @@
 """
 Updates router - Check for mod updates
 """
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
 from datetime import datetime, timezone
+import time
 from models import UpdateInfo
-from database import get_all_mods, update_mod
+from database import update_mod, record_update_history, get_update_history
 from nexusmods_client import get_nexusmods_client
+from registry import mod_registry
+from scheduler import CHECK_BUDGET, parse_timestamp, plan_checks, schedule
+from catalog import sync_catalog, changed_since, covers
+from jobs import register_job
+from events import broker
 
 router = APIRouter()
 
@@ -39,6 +45,14 @@ def check_mod_update(mod: dict) -> dict:
         if not matching_files:
             return None
 
+        # Every upload of this file (archived versions included) feeds the check scheduler
+        history_files = [f for f in files if f.get('name', '') == current_name] or matching_files
+        record_update_history(mod['game'], mod['mod_id'], [
+            (f['file_id'], f['uploaded_timestamp'])
+            for f in history_files
+            if f.get('file_id') and f.get('uploaded_timestamp')
+        ])
+
         # Find the latest file by file_id
         latest_file = max(matching_files, key=lambda f: f.get('file_id', 0))
 
@@ -58,6 +72,7 @@ def check_mod_update(mod: dict) -> dict:
         })
 
         if update_available:
+            broker.publish('update', ids=[mod['id']])
             download_url = client.get_download_link(
                 mod['game'],
                 mod['mod_id'],
@@ -82,72 +97,95 @@ def check_mod_update(mod: dict) -> dict:
         print(f"Error checking updates for mod {mod['mod_id']}: {e}")
         return None
 
-def _pick_period(mods: list) -> str:
-    """Pick the smallest batch period that covers the oldest last_checked."""
-    now = datetime.now(timezone.utc)
-    oldest = None
-    for mod in mods:
-        lc = mod.get("last_checked")
-        if not lc:
-            return "1m"  # never checked → use largest period
-        if isinstance(lc, str):
-            lc = datetime.fromisoformat(lc).replace(tzinfo=timezone.utc)
-        if oldest is None or lc < oldest:
-            oldest = lc
-    if oldest is None:
-        return "1m"
-    delta = now - oldest
-    if delta.days < 1:
-        return "1d"
-    if delta.days < 7:
-        return "1w"
-    return "1m"
+# Tolerance when comparing Nexusmods upload times with our last_checked
+_CLOCK_SLACK = 60
 
-@router.get("/check", response_model=List[UpdateInfo])
-def check_all_updates():
-    """Check tracked mods for updates using the batch updated-mods endpoint.
-    Only queries individual mod files for mods that Nexusmods reports as recently updated."""
-    mods = get_all_mods()
+def _check_all(budget: Optional[int] = None, track=iter) -> List[dict]:
+    """Run a check-all pass, iterating the mods to query through `track`"""
+    mods = mod_registry.all()
     if not mods:
         return []
 
     client = get_nexusmods_client()
-    period = _pick_period(mods)
-
-    # Group tracked mods by game
-    by_game: dict[str, list[dict]] = {}
-    for mod in mods:
-        by_game.setdefault(mod["game"], []).append(mod)
+    budget = budget or CHECK_BUDGET
+    by_game = mod_registry.by_game()
 
-    # Fetch recently updated mod_ids per game (one API call per game)
-    updated_mod_ids: set[int] = set()
+    # Sync the local updated-mods mirror (at most one feed call per game),
+    # then decide locally which mods changed since they were last checked
+    updated_mod_ids: set[tuple[str, int]] = set()
+    candidates = []
     for game, game_mods in by_game.items():
         try:
-            updated = client.get_updated_mods(game, period)
-            updated_mod_ids.update(entry.get("mod_id") for entry in updated)
+            sync = sync_catalog(client, game)
         except Exception as e:
-            print(f"[check-all] Failed to fetch updated mods for {game}: {e}")
-            # Fallback: check all mods for this game
-            updated_mod_ids.update(mod["mod_id"] for mod in game_mods)
+            print(f"[check-all] Failed to sync updated mods for {game}: {e}")
+            # Fallback: let the scheduler pick the mods that are due
+            candidates.extend(game_mods)
+            continue
+
+        checked_at = {
+            mod["id"]: parse_timestamp(mod.get("last_checked")).timestamp()
+            for mod in game_mods if mod.get("last_checked")
+        }
+        oldest = min(checked_at.values(), default=time.time())
+        changed = changed_since(game, oldest - _CLOCK_SLACK)
+
+        for mod in game_mods:
+            last = checked_at.get(mod["id"])
+            entry = changed.get(mod["mod_id"])
+            # Always check mods that have never been checked before
+            if last is None or (entry and entry["latest_file_update"] > last - _CLOCK_SLACK):
+                updated_mod_ids.add((game, mod["mod_id"]))
+                candidates.append(mod)
+            elif not covers(sync, last):
+                # Checked before the mirror's coverage starts: fall back to the schedule
+                candidates.append(mod)
+
+    to_check, deferred = plan_checks(candidates, get_update_history(), updated_mod_ids, budget)
 
-    # Check mods whose mod_id appeared in the batch response,
-    # and always check mods that have never been checked before
     updates = []
-    checked = 0
-    skipped = 0
-    for mod in mods:
-        never_checked = not mod.get("last_checked")
-        if not never_checked and mod["mod_id"] not in updated_mod_ids:
-            skipped += 1
-            continue
-        checked += 1
+    for mod in track(to_check):
         update_info = check_mod_update(mod)
         if update_info:
             updates.append(update_info)
 
-    print(f"[check-all] period={period}, checked={checked}, skipped={skipped}, updates={len(updates)}")
+    skipped = len(mods) - len(to_check) - len(deferred)
+    print(f"[check-all] checked={len(to_check)}, skipped={skipped}, "
+          f"deferred={len(deferred)}, updates={len(updates)}")
     return updates
 
+@router.get("/check", response_model=List[UpdateInfo])
+def check_all_updates(budget: Optional[int] = Query(None, ge=1)):
+    """Check tracked mods for updates using the batch updated-mods endpoint.
+    Only queries individual mod files for mods that Nexusmods reports as recently updated.
+    If the batch endpoint fails for a game, falls back to the adaptive schedule
+    for that game's mods. At most `budget` mods are queried per run."""
+    return _check_all(budget)
+
+@register_job("check-all")
+def check_all_job(job):
+    return _check_all(job.params.get("budget"), job.track)
+
+@router.get("/schedule")
+def get_check_schedule():
+    """Per-mod check interval and next check time, soonest first"""
+    now = datetime.now(timezone.utc)
+    entries = schedule(mod_registry.all(), get_update_history(), now)
+    entries.sort(key=lambda e: e["next_check"])
+    return [
+        {
+            "id": e["mod"]["id"],
+            "mod_id": e["mod"]["mod_id"],
+            "game": e["mod"]["game"],
+            "mod_name": e["mod"].get("mod_name"),
+            "last_checked": e["mod"].get("last_checked"),
+            "interval_hours": round(e["interval_hours"], 2),
+            "next_check": e["next_check"].isoformat(),
+            "due": e["next_check"] <= now,
+        }
+        for e in entries
+    ]
+
 @router.get("/check/{mod_db_id}", response_model=UpdateInfo)
 def check_single_update(mod_db_id: int):
     """Check a specific mod for updates"""
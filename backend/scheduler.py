@@ -0,0 +1,97 @@
+"""
+Adaptive update-check scheduling.
+
+Each mod's check interval is derived from how often its files have been
+uploaded in the past: frequently updated mods are checked often, abandoned
+ones rarely. A per-run API budget caps how many mods one check-all may query,
+and a priority queue spends it on the mods most likely to have changed.
+"""
+import heapq
+import os
+from datetime import datetime, timezone
+from statistics import median
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+MIN_INTERVAL_HOURS = float(os.getenv("UPDATE_CHECK_MIN_HOURS", "6"))
+MAX_INTERVAL_HOURS = float(os.getenv("UPDATE_CHECK_MAX_HOURS", str(24 * 30)))
+CHECK_BUDGET = int(os.getenv("UPDATE_CHECK_BUDGET", "100"))
+
+# Gaps considered when estimating a mod's update cadence
+_RECENT_GAPS = 5
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """Parse a stored timestamp (naive values are UTC) into an aware datetime"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+def check_interval_hours(uploads: List[int], now: datetime) -> float:
+    """
+    Hours to wait between checks, given a mod's upload timestamps (oldest first).
+    Uses half the median recent gap between uploads; with less history, the
+    time since the last upload stands in for the gap.
+    """
+    now_ts = now.timestamp()
+    if len(uploads) >= 2:
+        recent = uploads[-(_RECENT_GAPS + 1):]
+        gap_hours = median(b - a for a, b in zip(recent, recent[1:])) / 3600
+        # A mod that has gone quiet for longer than its cadence is probably slowing down
+        gap_hours = max(gap_hours, (now_ts - uploads[-1]) / 3600 / 2)
+    elif uploads:
+        gap_hours = (now_ts - uploads[-1]) / 3600
+    else:
+        return MIN_INTERVAL_HOURS
+    return min(max(gap_hours / 2, MIN_INTERVAL_HOURS), MAX_INTERVAL_HOURS)
+
+def schedule(mods: Iterable[dict], history: Dict[Tuple[str, int], List[int]],
+             now: datetime) -> List[dict]:
+    """Compute interval, next check time and priority (overdue ratio) per mod"""
+    entries = []
+    for mod in mods:
+        interval = check_interval_hours(history.get((mod['game'], mod['mod_id']), []), now)
+        last_checked = parse_timestamp(mod.get('last_checked'))
+        if last_checked is None:
+            next_check = now
+            priority = float('inf')
+        else:
+            elapsed = (now - last_checked).total_seconds() / 3600
+            next_check = datetime.fromtimestamp(
+                last_checked.timestamp() + interval * 3600, tz=timezone.utc
+            )
+            priority = elapsed / interval
+        entries.append({
+            'mod': mod,
+            'interval_hours': interval,
+            'next_check': next_check,
+            'priority': priority,
+        })
+    return entries
+
+def plan_checks(mods: List[dict], history: Dict[Tuple[str, int], List[int]],
+                forced: Set[Tuple[str, int]], budget: int,
+                now: Optional[datetime] = None) -> Tuple[List[dict], List[dict]]:
+    """
+    Pick which mods to check this run, most-likely-updated first.
+    Mods whose (game, mod_id) is in forced (reported updated by Nexusmods) and never-checked
+    mods always qualify; the rest only once their next check time has passed.
+    Returns (to_check, deferred) where deferred qualified but exceeded the budget.
+    """
+    now = now or datetime.now(timezone.utc)
+    heap = []
+    for i, entry in enumerate(schedule(mods, history, now)):
+        mod = entry['mod']
+        is_forced = (mod['game'], mod['mod_id']) in forced
+        if not is_forced and entry['priority'] < 1:
+            continue
+        heapq.heappush(heap, (not is_forced, -entry['priority'], i, mod))
+
+    to_check = []
+    deferred = []
+    while heap:
+        mod = heapq.heappop(heap)[3]
+        (to_check if len(to_check) < budget else deferred).append(mod)
+    return to_check, deferred
@@ -0,0 +1,99 @@
+"""
+Two-way sync between the local mods table and the Nexusmods tracked list.
+
+The tracked list is stored in nexus_tracked and downloaded again once it is
+older than TRACKED_PULL_INTERVAL, or before a sync pushes any track (so a
+mod tracked on the website since the last pull is not taken for one of
+ours). Each sync then compares the stored copy with the local
+(game, mod_id) pairs and pushes only the differences:
+- mods present locally but not tracked are tracked;
+- mods this app tracked (managed) whose local rows are gone are untracked.
+Only a track pushed by this app marks an entry managed, so mods the user
+tracked on the website are never untracked, even when a local copy of them
+is deleted. Pushes stop at TRACKED_SYNC_BATCH per run, or when the hourly
+quota is down to NEXUS_QUOTA_RESERVE. Whatever is left over goes out on the
+next sync.
+"""
+import os
+import time
+from typing import Callable, Iterable, Optional
+from database import get_tracked, get_tracked_pulled_at, replace_tracked, set_tracked
+from registry import mod_registry
+
+TRACKED_PULL_INTERVAL = int(os.getenv("TRACKED_PULL_INTERVAL", "86400"))
+TRACKED_SYNC_BATCH = int(os.getenv("TRACKED_SYNC_BATCH", "50"))
+# Hourly requests left untouched for interactive lookups
+QUOTA_RESERVE = int(os.getenv("NEXUS_QUOTA_RESERVE", "20"))
+
+def _key(entry: dict) -> Optional[tuple]:
+    game = entry.get('domain_name') or entry.get('game')
+    mod_id = entry.get('mod_id')
+    return (game, int(mod_id)) if game and mod_id else None
+
+def pull_tracked(client, force: bool = False) -> Optional[dict]:
+    """
+    Refresh the stored tracked list from Nexusmods if it is older than
+    TRACKED_PULL_INTERVAL (or force). Returns the diff, or None if skipped.
+    """
+    pulled_at = get_tracked_pulled_at()
+    now = int(time.time())
+    if pulled_at is not None and not force and now - pulled_at < TRACKED_PULL_INTERVAL:
+        return None
+    keys = {k for k in map(_key, client.get_tracked_mods()) if k}
+    diff = replace_tracked(keys, now)
+    print(f"[tracked] Pulled {len(keys)} tracked mods (+{len(diff['added'])} -{len(diff['removed'])})")
+    return diff
+
+def pending_changes() -> dict:
+    """What a sync would push, from the stored list and the local mods"""
+    local = mod_registry.game_mods()
+    remote = {(e['game'], e['mod_id']): e['managed'] for e in get_tracked()}
+    return {
+        'track': sorted(local - remote.keys()),
+        'untrack': sorted(k for k, managed in remote.items() if managed and k not in local),
+    }
+
+def sync_tracked(client, force_pull: bool = False, batch: Optional[int] = None,
+                 track: Callable[[Iterable], Iterable] = iter) -> dict:
+    """Pull the tracked list if stale, then push up to `batch` differences"""
+    batch = TRACKED_SYNC_BATCH if batch is None else batch
+    diff = pull_tracked(client, force_pull)
+    changes = pending_changes()
+    if changes['track'] and diff is None:
+        # Tracking a mod the user added on the website since the last pull
+        # would wrongly mark it managed, so check against a fresh list first
+        diff = pull_tracked(client, force=True)
+        changes = pending_changes()
+
+    ops = [(k, True) for k in changes['track']] + [(k, False) for k in changes['untrack']]
+    pushed = {'tracked': 0, 'untracked': 0}
+    stopped = None
+    for (game, mod_id), tracked in track(ops[:batch]):
+        remaining = getattr(client, 'hourly_remaining', None)
+        if remaining is not None and remaining <= QUOTA_RESERVE:
+            stopped = f"hourly quota reserve reached ({remaining} left)"
+            break
+        try:
+            if tracked:
+                client.track_mod(game, mod_id)
+            else:
+                client.untrack_mod(game, mod_id)
+        except Exception as e:
+            stopped = f"{'track' if tracked else 'untrack'} {game}/{mod_id} failed: {e}"
+            break
+        set_tracked(game, mod_id, tracked)
+        pushed['tracked' if tracked else 'untracked'] += 1
+
+    done = pushed['tracked'] + pushed['untracked']
+    if done or stopped:
+        print(f"[tracked] Pushed {pushed['tracked']} track / {pushed['untracked']} untrack"
+              + (f"; stopped: {stopped}" if stopped else ""))
+    return {
+        'pulled': diff is not None,
+        'remote_added': len(diff['added']) if diff else 0,
+        'remote_removed': len(diff['removed']) if diff else 0,
+        **pushed,
+        'remaining': len(ops) - done,
+        'stopped': stopped,
+        'pulled_at': get_tracked_pulled_at(),
+    }
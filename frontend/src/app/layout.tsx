@@ -4,6 +4,7 @@ import { ThemeProvider } from "next-themes";
 import { Toaster } from "@/components/ui/sonner";
 import { Sidebar } from "@/components/layout/sidebar";
 import { Header } from "@/components/layout/header";
+import { LiveUpdates } from "@/components/layout/live-updates";
 import "./globals.css";
 
 const geistSans = Geist({
@@ -43,6 +44,7 @@ export default function RootLayout({
               <main className="flex-1 overflow-y-auto p-6">{children}</main>
             </div>
           </div>
+          <LiveUpdates />
           <Toaster />
         </ThemeProvider>
       </body>
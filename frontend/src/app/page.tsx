@@ -1,30 +1,25 @@
 "use client";
 
-import { useMods } from "@/hooks/use-mods";
-import { useLocalFiles } from "@/hooks/use-local-files";
+import { useStats } from "@/hooks/use-stats";
 import { StatsOverview } from "@/components/dashboard/stats-card";
 import { RecentUpdates } from "@/components/dashboard/recent-updates";
 import { QuickActions } from "@/components/dashboard/quick-actions";
 import { AlertCircle } from "lucide-react";
 
 export default function DashboardPage() {
-  const { mods, isLoading: modsLoading, isError: modsError, mutate: mutateMods } = useMods();
-  const { files, isLoading: filesLoading, isError: filesError, mutate: mutateFiles } = useLocalFiles();
+  const { stats, isLoading, isError: hasError, mutate } = useStats();
 
-  const isLoading = modsLoading || filesLoading;
-  const hasError = modsError || filesError;
-
-  const totalMods = mods?.length ?? 0;
-  const updatesAvailable = mods?.filter((m) => m.update_available).length ?? 0;
-  const totalFiles = files?.length ?? 0;
-  const unmappedFiles = files?.filter((f) => !f.mapped).length ?? 0;
+  const totalMods = stats?.total_mods ?? 0;
+  const updatesAvailable = stats?.updates_available ?? 0;
+  const totalFiles = stats?.local_files?.total ?? 0;
+  const unmappedFiles = stats?.local_files?.unmapped ?? 0;
 
   function handleUpdatesChecked() {
-    mutateMods();
+    mutate();
   }
 
   function handleScanComplete() {
-    mutateFiles();
+    mutate();
   }
 
   return (
@@ -58,7 +53,11 @@ export default function DashboardPage() {
       />
 
       <div className="grid gap-6 lg:grid-cols-2">
-        <RecentUpdates mods={mods} isLoading={modsLoading} />
+        <RecentUpdates
+          updates={stats?.updates}
+          recentlyChecked={stats?.recently_checked}
+          isLoading={isLoading}
+        />
         <QuickActions
           onUpdatesChecked={handleUpdatesChecked}
           onScanComplete={handleScanComplete}
@@ -29,7 +29,8 @@ import {
 } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { Badge } from "@/components/ui/badge";
-import { healthApi } from "@/lib/api";
+import { healthApi, nexusmodsApi } from "@/lib/api";
+import type { NexusmodsStatus } from "@/lib/types";
 
 const API_BASE_URL =
   process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
@@ -47,11 +48,17 @@ export default function SettingsPage() {
     setMounted(true);
   }, []);
 
+  const [nexusStatus, setNexusStatus] = useState<NexusmodsStatus | null>(null);
+
   useEffect(() => {
     healthApi
       .check()
       .then(() => setBackendStatus("online"))
       .catch(() => setBackendStatus("offline"));
+    nexusmodsApi
+      .status()
+      .then(setNexusStatus)
+      .catch(() => setNexusStatus(null));
   }, []);
 
   const themeOptions: { value: Theme; label: string; icon: React.ReactNode }[] =
@@ -156,6 +163,53 @@ export default function SettingsPage() {
               </p>
             </div>
 
+            <div className="space-y-1.5">
+              <label className="text-muted-foreground flex items-center gap-1.5 text-sm font-medium">
+                <Globe className="size-3.5" />
+                Nexusmods API
+              </label>
+              <div className="flex items-center gap-2 rounded-md border px-3 py-2 text-sm">
+                {!nexusStatus && (
+                  <span className="text-muted-foreground">Unknown</span>
+                )}
+                {nexusStatus?.state === "closed" && (
+                  <>
+                    <span className="size-2 rounded-full bg-green-500" />
+                    <span className="text-green-600 dark:text-green-400">
+                      Reachable
+                    </span>
+                  </>
+                )}
+                {nexusStatus?.state === "half_open" && (
+                  <>
+                    <span className="size-2 rounded-full bg-amber-500" />
+                    <span className="text-amber-600 dark:text-amber-400">
+                      Recovering
+                    </span>
+                  </>
+                )}
+                {nexusStatus?.state === "open" && (
+                  <>
+                    <span className="size-2 rounded-full bg-red-500" />
+                    <span className="text-red-600 dark:text-red-400">
+                      Unavailable, retrying in {Math.ceil(nexusStatus.retry_in_seconds)}s
+                    </span>
+                  </>
+                )}
+                {nexusStatus?.offline && (
+                  <Badge variant="secondary" className="ml-auto">
+                    Offline mode
+                  </Badge>
+                )}
+              </div>
+              {nexusStatus?.state === "open" && nexusStatus.last_error && (
+                <p className="text-muted-foreground flex items-start gap-1.5 text-xs">
+                  <Info className="mt-0.5 size-3 shrink-0" />
+                  {nexusStatus.last_error}
+                </p>
+              )}
+            </div>
+
             <div className="space-y-1.5">
               <label className="text-muted-foreground flex items-center gap-1.5 text-sm font-medium">
                 <Database className="size-3.5" />
@@ -12,7 +12,8 @@ import {
 import { toast } from "sonner";
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
-import { updatesApi, localFilesApi } from "@/lib/api";
+import { jobsApi, localFilesApi } from "@/lib/api";
+import type { UpdateInfo } from "@/lib/types";
 import { cn } from "@/lib/utils";
 
 interface QuickActionsProps {
@@ -28,7 +29,7 @@ export function QuickActions({ onUpdatesChecked, onScanComplete }: QuickActionsP
   async function handleCheckUpdates() {
     setCheckingUpdates(true);
     try {
-      const updates = await updatesApi.checkAll();
+      const updates = await jobsApi.run<UpdateInfo[]>("check-all");
       const withUpdates = updates.filter((u) => u.update_available);
       if (withUpdates.length > 0) {
         toast.info(`${withUpdates.length} update(s) available`);
@@ -13,22 +13,16 @@ import { formatDistanceToNow } from "date-fns";
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { cn } from "@/lib/utils";
-import type { Mod } from "@/lib/types";
+import type { ModSummary } from "@/lib/types";
 
 interface RecentUpdatesProps {
-  mods: Mod[] | undefined;
+  updates: ModSummary[] | undefined;
+  recentlyChecked: ModSummary[] | undefined;
   isLoading: boolean;
 }
 
-export function RecentUpdates({ mods, isLoading }: RecentUpdatesProps) {
-  const modsWithUpdates = mods?.filter((m) => m.update_available) ?? [];
-  const recentlyChecked = mods
-    ?.filter((m) => m.last_checked)
-    .sort(
-      (a, b) =>
-        new Date(b.last_checked!).getTime() - new Date(a.last_checked!).getTime()
-    )
-    .slice(0, 5);
+export function RecentUpdates({ updates, recentlyChecked, isLoading }: RecentUpdatesProps) {
+  const modsWithUpdates = updates ?? [];
 
   if (isLoading) {
     return (
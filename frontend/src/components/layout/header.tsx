@@ -5,7 +5,8 @@ import { RefreshCwIcon, Loader2Icon } from "lucide-react";
 import { toast } from "sonner";
 import { useSWRConfig } from "swr";
 import { Button } from "@/components/ui/button";
-import { modsApi, updatesApi, localFilesApi } from "@/lib/api";
+import { jobsApi, localFilesApi } from "@/lib/api";
+import type { UpdateInfo } from "@/lib/types";
 
 export function Header() {
   const { mutate } = useSWRConfig();
@@ -21,7 +22,7 @@ export function Header() {
         const names = detect.details.map(d => d.mod_name || d.new_file).join(", ");
         messages.push(`Auto-updated ${detect.updated} mod(s): ${names}`);
       }
-      const cleanup = await modsApi.cleanup();
+      const cleanup = await jobsApi.run<{ removed: number }>("cleanup");
       if (cleanup.removed > 0) {
         messages.push(`Removed ${cleanup.removed} missing entry/entries`);
       }
@@ -41,7 +42,7 @@ export function Header() {
   const handleCheckUpdates = async () => {
     setChecking(true);
     try {
-      const updates = await updatesApi.checkAll();
+      const updates = await jobsApi.run<UpdateInfo[]>("check-all");
       const withUpdates = updates.filter((u) => u.update_available);
       if (withUpdates.length > 0) {
         toast.info(`${withUpdates.length} update(s) available`);
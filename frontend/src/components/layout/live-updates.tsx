@@ -0,0 +1,8 @@
+"use client";
+
+import { useLiveUpdates } from "@/hooks/use-live-updates";
+
+export function LiveUpdates() {
+  useLiveUpdates();
+  return null;
+}
@@ -0,0 +1,82 @@
+/**
+ * Live invalidation over server-sent events, with polling as the fallback
+ */
+import { useEffect, useSyncExternalStore } from "react";
+import { useSWRConfig } from "swr";
+import { eventsUrl } from "@/lib/api";
+
+// Used by data hooks only while the event stream is down
+export const FALLBACK_POLL_MS = 30_000;
+
+let connected = false;
+const listeners = new Set<() => void>();
+
+function setConnected(value: boolean) {
+  if (connected !== value) {
+    connected = value;
+    listeners.forEach((listener) => listener());
+  }
+}
+
+function subscribe(listener: () => void) {
+  listeners.add(listener);
+  return () => listeners.delete(listener);
+}
+
+export function useLiveConnected() {
+  return useSyncExternalStore(subscribe, () => connected, () => false);
+}
+
+/** refreshInterval for SWR hooks: off while live events are flowing */
+export function useFallbackPolling() {
+  return useLiveConnected() ? 0 : FALLBACK_POLL_MS;
+}
+
+const startsWith = (...prefixes: string[]) => (key: unknown) =>
+  typeof key === "string" && prefixes.some((prefix) => key.startsWith(prefix));
+
+/** Open the event stream once and revalidate the SWR keys each event touches */
+export function useLiveUpdates() {
+  const { mutate } = useSWRConfig();
+
+  useEffect(() => {
+    const source = new EventSource(eventsUrl());
+    let dropped = false;
+
+    source.addEventListener("hello", () => {
+      // After a reconnect, refetch whatever changed while the stream was down
+      if (dropped) mutate(startsWith("/api/"));
+      dropped = false;
+      setConnected(true);
+    });
+    source.addEventListener("mods", (e) => {
+      const { ids } = JSON.parse((e as MessageEvent).data) as { ids: number[] | null };
+      // Lists and stats always; single-mod keys only for the rows that changed
+      mutate((key) => {
+        if (typeof key !== "string") return false;
+        const detail = key.match(/^\/api\/mods\/(\d+)$/);
+        if (detail) return ids === null || ids.includes(Number(detail[1]));
+        return key.startsWith("/api/mods") || key.startsWith("/api/stats");
+      });
+    });
+    source.addEventListener("update", () => {
+      mutate(startsWith("/api/stats", "/api/mods"));
+    });
+    source.addEventListener("local_files", () => {
+      mutate(startsWith("/api/local-files", "/api/stats"));
+    });
+    source.addEventListener("resync", () => {
+      mutate(startsWith("/api/"));
+    });
+    // EventSource reconnects by itself (resuming from Last-Event-ID); poll meanwhile
+    source.onerror = () => {
+      dropped = true;
+      setConnected(false);
+    };
+
+    return () => {
+      source.close();
+      setConnected(false);
+    };
+  }, [mutate]);
+}
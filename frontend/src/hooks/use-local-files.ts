@@ -2,16 +2,19 @@
  * SWR hook for local files data
  */
 import useSWR from "swr";
+import { useFallbackPolling } from "@/hooks/use-live-updates";
 import { localFilesApi } from "@/lib/api";
 import type { LocalFile, ScanResult } from "@/lib/types";
 
 export function useLocalFiles() {
+  const refreshInterval = useFallbackPolling();
   const { data, error, isLoading, mutate } = useSWR<LocalFile[]>(
     "/api/local-files",
     localFilesApi.list,
     {
       revalidateOnFocus: false,
       revalidateOnReconnect: true,
+      refreshInterval,
     }
   );
 
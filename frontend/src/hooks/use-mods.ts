@@ -2,16 +2,19 @@
  * SWR hook for mods data
  */
 import useSWR from "swr";
+import { useFallbackPolling } from "@/hooks/use-live-updates";
 import { modsApi } from "@/lib/api";
 import type { Mod } from "@/lib/types";
 
 export function useMods() {
+  const refreshInterval = useFallbackPolling();
   const { data, error, isLoading, mutate } = useSWR<Mod[]>(
     "/api/mods",
     modsApi.list,
     {
       revalidateOnFocus: false,
       revalidateOnReconnect: true,
+      refreshInterval,
     }
   );
 
@@ -0,0 +1,27 @@
+/**
+ * SWR hook for dashboard stats
+ */
+import useSWR from "swr";
+import { useFallbackPolling } from "@/hooks/use-live-updates";
+import { statsApi } from "@/lib/api";
+import type { DashboardStats } from "@/lib/types";
+
+export function useStats() {
+  const refreshInterval = useFallbackPolling();
+  const { data, error, isLoading, mutate } = useSWR<DashboardStats>(
+    "/api/stats",
+    statsApi.get,
+    {
+      revalidateOnFocus: false,
+      revalidateOnReconnect: true,
+      refreshInterval,
+    }
+  );
+
+  return {
+    stats: data,
+    isLoading,
+    isError: error,
+    mutate,
+  };
+}
@@ -2,13 +2,13 @@
  * SWR hook for updates data
  */
 import useSWR from "swr";
-import { updatesApi } from "@/lib/api";
+import { jobsApi, updatesApi } from "@/lib/api";
 import type { UpdateInfo } from "@/lib/types";
 
 export function useUpdates(autoCheck = false) {
   const { data, error, isLoading, mutate } = useSWR<UpdateInfo[]>(
     autoCheck ? "/api/updates/check" : null,
-    updatesApi.checkAll,
+    checkUpdatesManually,
     {
       revalidateOnFocus: false,
       revalidateOnReconnect: false,
@@ -27,7 +27,8 @@ export function useUpdates(autoCheck = false) {
 
 export async function checkUpdatesManually() {
   try {
-    const updates = await updatesApi.checkAll();
+    // Runs as a background job so a long check never holds a request open
+    const updates = await jobsApi.run<UpdateInfo[]>("check-all");
     return updates;
   } catch (error) {
     throw error;
@@ -4,13 +4,24 @@
 
 import type {
   Mod,
+  ModSearchResult,
+  ModChanges,
   ModCreate,
+  ModBatchResult,
+  ModBulkResult,
   ModUpdate,
   LocalFile,
   UpdateInfo,
   ScanResult,
   NexusmodsMod,
   NexusmodsFile,
+  NexusmodsStatus,
+  TrackedMod,
+  TrackedSyncResult,
+  Job,
+  DashboardStats,
+  BackupInfo,
+  ImportResult,
 } from "./types";
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
@@ -70,12 +81,28 @@ export const modsApi = {
 
   get: (id: number) => fetchApi<Mod>(`/api/mods/${id}`),
 
+  search: (q: string, limit = 50) =>
+    fetchApi<ModSearchResult[]>(
+      `/api/mods/search?q=${encodeURIComponent(q)}&limit=${limit}`
+    ),
+
+  changes: (since?: number, limit = 1000) =>
+    fetchApi<ModChanges>(
+      `/api/mods/changes?limit=${limit}${since !== undefined ? `&since=${since}` : ""}`
+    ),
+
   create: (data: ModCreate) =>
     fetchApi<Mod>("/api/mods/", {
       method: "POST",
       body: JSON.stringify(data),
     }),
 
+  createBatch: (items: ModCreate[]) =>
+    fetchApi<ModBatchResult>("/api/mods/batch", {
+      method: "POST",
+      body: JSON.stringify({ items }),
+    }),
+
   update: (id: number, data: ModUpdate) =>
     fetchApi<Mod>(`/api/mods/${id}`, {
       method: "PATCH",
@@ -97,6 +124,12 @@ export const modsApi = {
     fetchApi<Mod>(`/api/mods/${id}/mark-updated`, {
       method: "POST",
     }),
+
+  bulk: (action: "delete" | "untrack" | "mark-updated", ids: number[]) =>
+    fetchApi<ModBulkResult>(`/api/mods/bulk/${action}`, {
+      method: "POST",
+      body: JSON.stringify({ ids }),
+    }),
 };
 
 /**
@@ -142,8 +175,101 @@ export const nexusmodsApi = {
 
   getFiles: (game: string, modId: number) =>
     fetchApi<NexusmodsFile[]>(`/api/nexusmods/files/${game}/${modId}`),
+
+  status: () => fetchApi<NexusmodsStatus>("/api/nexusmods/status"),
+
+  tracked: () => fetchApi<TrackedMod[]>("/api/nexusmods/tracked"),
+
+  syncTracked: (pull = false) =>
+    fetchApi<TrackedSyncResult>(`/api/nexusmods/tracked/sync?pull=${pull}`, {
+      method: "POST",
+    }),
+
+  getOffline: () => fetchApi<{ offline: boolean }>("/api/nexusmods/offline"),
+
+  setOffline: (offline: boolean) =>
+    fetchApi<{ offline: boolean }>("/api/nexusmods/offline", {
+      method: "PUT",
+      body: JSON.stringify({ offline }),
+    }),
+};
+
+/**
+ * Background jobs API
+ */
+type JobType = "refresh-all" | "check-all" | "cleanup" | "sync-tracked" | "backup";
+
+const JOB_POLL_MS = 1000;
+
+export const jobsApi = {
+  list: () => fetchApi<Job[]>("/api/jobs/"),
+
+  get: <T = unknown>(id: string) => fetchApi<Job<T>>(`/api/jobs/${id}`),
+
+  submit: (type: JobType, params?: Record<string, unknown>) =>
+    fetchApi<Job>(`/api/jobs/${type}`, {
+      method: "POST",
+      body: JSON.stringify({ params: params ?? {} }),
+    }),
+
+  cancel: (id: string) =>
+    fetchApi<Job>(`/api/jobs/${id}/cancel`, {
+      method: "POST",
+    }),
+
+  /** Submit a job and poll it until it finishes; resolves with its result */
+  run: async <T>(
+    type: JobType,
+    params?: Record<string, unknown>,
+    onProgress?: (job: Job<T>) => void
+  ): Promise<T> => {
+    let job = (await jobsApi.submit(type, params)) as Job<T>;
+    while (job.status === "queued" || job.status === "running") {
+      onProgress?.(job);
+      await new Promise((resolve) => setTimeout(resolve, JOB_POLL_MS));
+      job = await jobsApi.get<T>(job.id);
+    }
+    if (job.status !== "succeeded") {
+      throw new ApiError(job.error || `Job ${job.status}`, 500, job);
+    }
+    return job.result as T;
+  },
+};
+
+/**
+ * Dashboard stats API
+ */
+export const statsApi = {
+  get: () => fetchApi<DashboardStats>("/api/stats/"),
+};
+
+/**
+ * Database backup and export/import API
+ */
+export const databaseApi = {
+  backups: () => fetchApi<BackupInfo[]>("/api/db/backups"),
+
+  backup: () =>
+    fetchApi<BackupInfo & { pages: number; restarts: number; seconds: number }>("/api/db/backup", {
+      method: "POST",
+    }),
+
+  exportUrl: (format: "ndjson" | "csv.gz" = "ndjson") =>
+    `${API_BASE_URL}/api/db/export?format=${encodeURIComponent(format)}`,
+
+  import: (file: Blob, format: "ndjson" | "csv.gz" = "ndjson") =>
+    fetchApi<ImportResult>(`/api/db/import?format=${encodeURIComponent(format)}`, {
+      method: "POST",
+      body: file,
+      headers: { "Content-Type": "application/octet-stream" },
+    }),
 };
 
+/**
+ * Server-sent invalidation events
+ */
+export const eventsUrl = () => `${API_BASE_URL}/api/events`;
+
 /**
  * Config API
  */
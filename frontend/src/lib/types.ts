@@ -27,6 +27,20 @@ export interface Mod {
   updated_at: string;
 }
 
+export interface ModSearchResult extends Mod {
+  rank: number;
+  snippet: string | null;
+}
+
+export interface ModChanges {
+  cursor: number;
+  reset: boolean;
+  has_more: boolean;
+  upserts: Mod[];
+  deletes: number[];
+  updates_available: number[];
+}
+
 export interface ModCreate {
   local_file: string;
   mod_id: number;
@@ -34,6 +48,18 @@ export interface ModCreate {
   game: string;
 }
 
+export interface ModBatchResult {
+  created: number;
+  failed: number;
+  results: Array<{
+    index: number;
+    local_file: string;
+    success: boolean;
+    mod: Mod | null;
+    error: string | null;
+  }>;
+}
+
 export interface ModUpdate {
   local_file?: string;
   file_id?: number;
@@ -78,6 +104,35 @@ export interface NexusmodsMod {
   updated_time: string;
 }
 
+export interface NexusmodsStatus {
+  state: "closed" | "open" | "half_open" | "unconfigured";
+  consecutive_failures: number;
+  failure_threshold: number;
+  retry_in_seconds: number;
+  last_error: string | null;
+  last_failure_at: number | null;
+  hourly_remaining: number | null;
+  daily_remaining: number | null;
+  offline: boolean;
+}
+
+export interface TrackedMod {
+  mod_id: number;
+  domain_name: string;
+  managed: boolean;
+}
+
+export interface TrackedSyncResult {
+  pulled: boolean;
+  remote_added: number;
+  remote_removed: number;
+  tracked: number;
+  untracked: number;
+  remaining: number;
+  stopped: string | null;
+  pulled_at: number | null;
+}
+
 export interface NexusmodsFile {
   file_id: number;
   name: string;
@@ -87,3 +142,78 @@ export interface NexusmodsFile {
   uploaded_time: string;
   file_name: string;
 }
+
+export type JobStatus = "queued" | "running" | "succeeded" | "failed" | "cancelled";
+
+export interface Job<T = unknown> {
+  id: string;
+  type: string;
+  status: JobStatus;
+  params: Record<string, unknown> | null;
+  progress_done: number;
+  progress_total: number | null;
+  result: T | null;
+  error: string | null;
+  cancel_requested: boolean;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
+export type ModSummary = Pick<
+  Mod,
+  | "id"
+  | "local_file"
+  | "mod_id"
+  | "file_id"
+  | "game"
+  | "name"
+  | "mod_name"
+  | "version"
+  | "latest_file_id"
+  | "latest_version"
+  | "last_checked"
+  | "update_available"
+>;
+
+export interface GameStats {
+  game: string;
+  mods: number;
+  updates_available: number;
+  total_bytes: number;
+}
+
+export interface DashboardStats {
+  total_mods: number;
+  updates_available: number;
+  total_bytes: number;
+  per_game: GameStats[];
+  updates: ModSummary[];
+  recently_checked: ModSummary[];
+  missing_files: number | null;
+  local_files: {
+    total: number;
+    unmapped: number;
+    total_bytes: number;
+  } | null;
+}
+
+export interface BackupInfo {
+  filename: string;
+  size_bytes: number;
+  created_at: string;
+}
+
+export interface ImportResult {
+  inserted: number;
+  skipped: number;
+  invalid: number;
+  errors: string[];
+}
+
+export interface ModBulkResult {
+  succeeded: number[];
+  missing: number[];
+  failed: { id: number; error: string }[];
+  files_queued: number;
+}